@@ -0,0 +1,314 @@
+# benchmark.py
+
+import argparse
+import contextlib
+import json
+import math
+import os
+import platform
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Tuple
+
+import config
+from decision_engine import choose_goal_via_simulation
+from execution_layer.world_state import WorldState
+from learning_layer import load_biases, save_biases, update_biases
+from memory import Memory
+from planning_layer.action import Action
+from planning_layer.domain_generator import generate_domain
+from planning_layer.domain_registry import get_available_actions, get_available_goals
+from planning_layer.lookahead import LookaheadSearch
+from planning_layer.plan_evaluator import evaluate_plan
+from planning_layer.planner import GOAPPlanner, plan_all_goals
+from strategy_layer import SCENARIOS
+from sweep import run_headless
+
+BASELINE_FILEPATH = "benchmark_baseline.json"
+RESULTS_FILEPATH = "benchmark_results.json"
+
+MOODS = ("DESPERATE", "STUCK", "AGGRESSIVE_DEFENDER", "PREPARING", "PATROLLING")
+
+
+def _best_seconds(fn: Callable[[], object], repeat: int) -> float:
+    """The fastest of `repeat` timed calls; the minimum is the least disturbed by other load on the machine."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+def _result(value: float, unit: str, higher_is_better: bool) -> Dict:
+    return {"value": round(value, 4), "unit": unit, "higher_is_better": higher_is_better}
+
+
+# --- Planner ---
+
+def _expansions_per_second(planner: GOAPPlanner, problems: List[Tuple[Dict, Dict, List[Action]]],
+                           repeat: int) -> Tuple[float, List[Tuple[List[Action] | None, int]]]:
+    """
+    The best rate over `repeat` passes through every problem, plus the
+    (plan, expansions) the last pass found for each problem.
+    """
+    best = 0.0
+    for _ in range(repeat):
+        expansions = 0
+        answers = []
+        started = time.perf_counter()
+        for start_state, goal_conditions, actions in problems:
+            plan = planner.find_plan(start_state, goal_conditions, actions)
+            expansions += planner.last_expansions
+            answers.append((plan, planner.last_expansions))
+        best = max(best, expansions / (time.perf_counter() - started))
+    return best, answers
+
+# (n_actions, n_numeric, n_boolean, depth, branching) of the generated domains,
+# from small to the generator's defaults. The larger ones are not all solved
+# within SYNTHETIC_MAX_ITERATIONS; that is the scaling limit being measured.
+SYNTHETIC_DOMAINS = ((60, 6, 6, 4, 4), (200, 20, 20, 6, 4), (200, 20, 20, 8, 8))
+SYNTHETIC_SEEDS = 3
+# Well above the agent's own cap, which is tuned for the small scenario domain.
+SYNTHETIC_MAX_ITERATIONS = 10000
+
+def bench_planner(repeat: int) -> Dict[str, Dict]:
+    """
+    A* expansions per second on every scenario (all goals) and on generated
+    domains. Plans for generated domains are checked against their reference
+    solution, so a faster planner that returns wrong or worse plans shows up too,
+    and searches that hit the iteration cap are counted rather than hidden.
+    """
+    planner = GOAPPlanner(cost_model=config.PLANNER_COST_MODEL, risk_aversion=config.PLANNER_RISK_AVERSION)
+    actions, goals = get_available_actions(), get_available_goals()
+    results = {}
+    for scenario_id, scenario in SCENARIOS.items():
+        problems = [(scenario["state"], goal.conditions, actions) for goal in goals]
+        rate, _ = _expansions_per_second(planner, problems, repeat)
+        results[f"planner.scenario_{scenario_id}.expansions_per_s"] = _result(rate, "expansions/s", True)
+
+    planner = GOAPPlanner(cost_model=config.PLANNER_COST_MODEL, risk_aversion=config.PLANNER_RISK_AVERSION,
+                          max_iterations=SYNTHETIC_MAX_ITERATIONS)
+    for n_actions, n_numeric, n_boolean, depth, branching in SYNTHETIC_DOMAINS:
+        domains = [generate_domain(n_actions, n_numeric, n_boolean, depth, branching, seed=seed)
+                   for seed in range(SYNTHETIC_SEEDS)]
+        name = f"planner.synthetic_{n_actions}a_{depth}d_{branching}b"
+        problems = [(domain.start_state, domain.goal.conditions, domain.actions) for domain in domains]
+        rate, answers = _expansions_per_second(planner, problems, repeat)
+        results[f"{name}.expansions_per_s"] = _result(rate, "expansions/s", True)
+
+        checks = [domain.check(plan) for domain, (plan, _) in zip(domains, answers)]
+        solved = [check for check in checks if check.valid]
+        capped = [expansions for _, expansions in answers if expansions >= SYNTHETIC_MAX_ITERATIONS]
+        results[f"{name}.solved_rate"] = _result(len(solved) / len(checks), "fraction", True)
+        results[f"{name}.capped_rate"] = _result(len(capped) / len(answers), "fraction", False)
+        if solved:
+            ratio = sum(check.cost_ratio for check in solved) / len(solved)
+            results[f"{name}.cost_ratio"] = _result(ratio, "x optimal", False)
+    return results
+
+
+# --- Decision ---
+
+def bench_choose_goal(repeat: int) -> Dict[str, Dict]:
+    """
+    Latency of the local simulator's goal choice, with a fresh (cold) lookahead
+    each call. The lookahead runs its full node budget with no time limit, so a
+    slower search shows up as higher latency instead of fewer iterations.
+    """
+    planner = GOAPPlanner(cost_model=config.PLANNER_COST_MODEL, risk_aversion=config.PLANNER_RISK_AVERSION)
+    results = {}
+    for scenario_id, scenario in SCENARIOS.items():
+        world_state = WorldState(initial_state=scenario["state"])
+        goal_plans = plan_all_goals(planner, world_state.state, get_available_goals(), get_available_actions())
+        seconds = _best_seconds(
+            lambda: choose_goal_via_simulation("PATROLLING", world_state, {}, goal_plans,
+                                               LookaheadSearch(time_budget=None, seed=0)),
+            repeat)
+        results[f"decision.choose_goal.scenario_{scenario_id}.latency_ms"] = _result(seconds * 1000, "ms", False)
+    return results
+
+def bench_evaluate_plan(repeat: int) -> Dict[str, Dict]:
+    """Latency of the Monte Carlo estimate run on each committed plan, for every scenario's cheapest plan."""
+    planner = GOAPPlanner(cost_model=config.PLANNER_COST_MODEL, risk_aversion=config.PLANNER_RISK_AVERSION)
+    results = {}
+    for scenario_id, scenario in SCENARIOS.items():
+        world_state = WorldState(initial_state=scenario["state"])
+        goal_plans = plan_all_goals(planner, world_state.state, get_available_goals(), get_available_actions())
+        actionable = [goal_plan for goal_plan in goal_plans.values() if goal_plan.actionable]
+        if not actionable:
+            continue
+        plan = min(actionable, key=lambda goal_plan: goal_plan.cost).plan
+        seconds = _best_seconds(lambda: evaluate_plan(plan, world_state, seed=0), repeat)
+        results[f"evaluator.scenario_{scenario_id}.latency_ms"] = _result(seconds * 1000, "ms", False)
+    return results
+
+
+# --- Persistence ---
+
+def _sample_event(index: int) -> Dict:
+    scenario = SCENARIOS[index % len(SCENARIOS) + 1]
+    return {
+        "type": "failure" if index % 3 else "success",
+        "reason": f"Action 'AttackEnemy' failed: The attack missed the enemy. (#{index})",
+        "plan": ["Retreat", "Rest", "AttackEnemy"],
+        "world_state": dict(scenario["state"]),
+    }
+
+def bench_memory(repeat: int, sizes: Tuple[int, ...] = (100, 1000, 5000)) -> Dict[str, Dict]:
+    """Memory.add_event and Memory.load throughput as the stored history grows."""
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in sizes:
+            memory = Memory(filepath=os.path.join(workdir, f"memory_{size}.json"))
+            memory.history = [_sample_event(index) for index in range(size)]
+            memory.save()
+            events = 20 * max(1, repeat)
+            started = time.perf_counter()
+            for index in range(events):
+                memory.add_event(_sample_event(size + index))
+            results[f"memory.add_event.history_{size}.events_per_s"] = _result(
+                events / (time.perf_counter() - started), "events/s", True)
+            seconds = _best_seconds(memory.load, repeat)
+            results[f"memory.load.history_{size}.latency_ms"] = _result(seconds * 1000, "ms", False)
+    return results
+
+def bench_biases(repeat: int) -> Dict[str, Dict]:
+    """load_biases/update_biases round trips against a bias file of realistic size."""
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        filepath = os.path.join(workdir, "action_biases.json")
+        save_biases({mood: {action.name: 0.1 for action in get_available_actions()} for mood in MOODS}, filepath)
+        seconds = _best_seconds(lambda: load_biases(filepath), repeat * 10)
+        results["biases.load.latency_ms"] = _result(seconds * 1000, "ms", False)
+        seconds = _best_seconds(lambda: update_biases("PREPARING", ["Retreat", "Rest"], 1.5, filepath), repeat * 10)
+        results["biases.update.latency_ms"] = _result(seconds * 1000, "ms", False)
+    return results
+
+
+# --- End to end ---
+
+def bench_cycles(repeat: int) -> Dict[str, Dict]:
+    """
+    Headless decide-plan-act-learn cycles per second, with the stand-in LLM and
+    no pauses, over `repeat` seeds. run_headless gives the lookahead no time
+    limit, so this measures the work per cycle rather than the time budget.
+    """
+    cycles = 0
+    elapsed = 0.0
+    for scenario_id, scenario in SCENARIOS.items():
+        for seed in range(repeat):
+            run = run_headless(scenario_id, scenario["state"], seed, max_cycles=10)
+            cycles += run["cycles"]
+            elapsed += run["wall_time"]
+    return {"loop.headless.cycles_per_s": _result(cycles / elapsed if elapsed else 0.0, "cycles/s", True)}
+
+
+BENCHMARKS = {
+    "planner": bench_planner,
+    "decision": bench_choose_goal,
+    "evaluator": bench_evaluate_plan,
+    "memory": bench_memory,
+    "biases": bench_biases,
+    "loop": bench_cycles,
+}
+
+
+def run_benchmarks(names: List[str], repeat: int) -> Dict:
+    """Runs the selected benchmark groups with their console output silenced."""
+    results = {}
+    for name in names:
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            results.update(BENCHMARKS[name](repeat))
+    return {
+        "metadata": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": repeat,
+            "groups": names,
+        },
+        "results": results,
+    }
+
+
+def _relative_change(previous: float, current: float) -> float:
+    if previous:
+        return (current - previous) / abs(previous)
+    return 0.0 if current == previous else math.copysign(math.inf, current - previous)
+
+def compare(results: Dict, baseline: Dict, tolerance: float) -> List[Tuple[str, float, float | None, float | None, bool]]:
+    """
+    Compares each metric with the baseline. Returns (name, baseline, current,
+    relative change, regressed) rows; a metric has regressed when it moved in
+    the wrong direction by more than `tolerance`. A baseline metric from a group
+    that was run but is missing now (e.g. a cost ratio once nothing is solved)
+    is a regression too, with current and change set to None.
+    """
+    groups = set(results["metadata"].get("groups", BENCHMARKS))
+    rows = []
+    for name, previous in baseline["results"].items():
+        current = results["results"].get(name)
+        if current is None:
+            if name.split(".")[0] in groups:
+                rows.append((name, previous["value"], None, None, True))
+            continue
+        change = _relative_change(previous["value"], current["value"])
+        worse = -change if current["higher_is_better"] else change
+        rows.append((name, previous["value"], current["value"], change, worse > tolerance))
+    return rows
+
+
+def print_results(results: Dict, rows: List[Tuple[str, float, float | None, float | None, bool]] | None):
+    compared = {row[0]: row for row in rows or []}
+    print(f"{'Metric':<52} {'Value':>12} {'Unit':<13} {'Baseline':>12} {'Change':>8}")
+    for name, result in results["results"].items():
+        line = f"{name:<52} {result['value']:>12.2f} {result['unit']:<13}"
+        if name in compared:
+            _, previous, _, change, regressed = compared[name]
+            line += f" {previous:>12.2f} {change:>+8.1%}" + ("  REGRESSION" if regressed else "")
+        print(line)
+    for name, previous, current, _, _ in rows or []:
+        if current is None:
+            print(f"{name:<52} {'missing':>12} {'':<13} {previous:>12.2f} {'':>8}  REGRESSION")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the planner, decision loop and persistence hot paths.")
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), default=list(BENCHMARKS),
+                        help="Benchmark groups to run (default: all).")
+    parser.add_argument("--repeat", type=int, default=5, help="Repetitions per measurement.")
+    parser.add_argument("--output", default=RESULTS_FILEPATH, help="Where to write this run's results.")
+    parser.add_argument("--baseline", default=BASELINE_FILEPATH, help="Baseline results to compare against.")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Relative slowdown allowed before a metric counts as a regression.")
+    parser.add_argument("--update-baseline", action="store_true", help="Save this run as the new baseline.")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.only, args.repeat)
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=4)
+
+    rows = None
+    if os.path.exists(args.baseline) and not args.update_baseline:
+        with open(args.baseline, 'r') as f:
+            rows = compare(results, json.load(f), args.tolerance)
+    print_results(results, rows)
+    print(f"\nResults written to {args.output}.")
+
+    if args.update_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=4)
+        print(f"Baseline updated: {args.baseline}.")
+    elif rows is None:
+        print(f"No baseline at {args.baseline}. Run with --update-baseline to create one.")
+    else:
+        regressions = [row[0] for row in rows if row[4]]
+        if regressions:
+            print(f"{len(regressions)} regression(s) beyond {args.tolerance:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+        print(f"No regressions beyond {args.tolerance:.0%}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,96 +2,63 @@
 
 import json
 from typing import Dict, Tuple
-from google import genai
+import telemetry
 from execution_layer.world_state import WorldState
 from memory import Memory
-import config
+from cognitive_layer.llm_backend import LLMBackend, GeminiBackend
+from cognitive_layer.prompt_builder import PromptBuilder
 
 class CognitiveEngine:
-    def __init__(self, api_key: str):
-        if not api_key: raise ValueError("API key for Gemini is not set.")
-        self.client = genai.Client(api_key=api_key)
-        self.model_name = config.GEMINI_MODEL_NAME
-        print("Cognitive Engine (LLM Expert) initialized successfully.")
-
-    def _create_goal_prompt(self, world_state: WorldState, mood: str, local_proposal: Tuple | None) -> str:
-        
-        local_recommendation = "My local simulation could not find a valid course of action."
-        if local_proposal:
-            local_goal, local_justification, _ = local_proposal
-            local_recommendation = (
-                f"My internal simulation has analyzed all immediate options. Here is my data-driven recommendation:\n"
-                f"- Recommended Goal: {local_goal}\n"
-                f"- Reasoning: {local_justification}"
-            )
-
-        prompt = f"""
-        
-        
-        You are the strategic advisor for an autonomous agent. I am the agent's local logic core. I have compiled a detailed report for your review.
-
-        **Intelligence Briefing:**
-
-        *   **Resource Status:** {thought_from_analyze_health}
-        *   **Threat Assessment:** {thought_from_analyze_threats}
-        *   **Lessons from Past Failures:** {thought_from_analyze_failures}
-        *   **Local Simulation Proposal:** {thought_from_analyze_simulation}
-        *   **Strategic Alert:** {thought_from_detect_repetition}
-
-        **Your Task:**
-        Synthesize all the points in this briefing. Your job is not just to pick the most obvious action, but to find the best long-term strategy. If you see a 'Strategic Alert', give it special consideration.
-
-        Choose the best goal and provide your reasoning. Respond with a JSON object: {"goal": "...", "justification": "..."}
-                You are the strategic advisor for an agent that is about to get stuck in a repetitive loop.
-
-
-        **Current World State:**
-        {json.dumps(world_state.state, indent=2)}
-
-        **My Local Simulation's Proposal:**
-        {local_recommendation}
-
-        **Your Task:**
-        Review my proposal and the world state. Do you agree with my data-driven choice, or do you see a superior long-term strategy?
-        Respond with a JSON object containing your chosen "goal" and a "justification" explaining your reasoning. If you agree with me, feel free to adopt my reasoning.
+    def __init__(self, api_key: str | None = None, backend: LLMBackend | None = None):
         """
-        return prompt
+        Args:
+            api_key (str): Gemini API key, used only when no backend is given.
+            backend (LLMBackend): Where prompts are sent. Defaults to live Gemini.
+        """
+        self.backend = backend if backend is not None else GeminiBackend(api_key)
+        self.prompt_builder = PromptBuilder()
+        print(f"Cognitive Engine (LLM Expert) initialized successfully with {type(self.backend).__name__}.")
+
+    def _create_goal_prompt(self, world_state: WorldState, memory: Memory, mood: str, biases: Dict, local_proposal: Tuple | None,
+                            goal_plans: Dict | None = None) -> str:
+        recent_failures = memory.get_recent_failures(n=self.prompt_builder.max_failures)
+        return self.prompt_builder.build_goal_prompt(world_state, recent_failures, mood, biases, local_proposal, goal_plans)
 
-    def generate_goal(self, world_state: WorldState, memory: Memory, mood: str, biases: Dict, local_proposal: Tuple | None) -> Tuple[str, str]:
-        prompt = self._create_goal_prompt(world_state, mood, local_proposal)
+    def generate_goal(self, world_state: WorldState, memory: Memory, mood: str, biases: Dict, local_proposal: Tuple | None,
+                      goal_plans: Dict | None = None) -> Tuple[str, str]:
+        prompt = self._create_goal_prompt(world_state, memory, mood, biases, local_proposal, goal_plans)
+        telemetry.increment("llm_calls_total", purpose="goal")
         try:
-            response = self.client.models.generate_content(model=self.model_name, contents=prompt)
-            if not hasattr(response, 'text') or not response.text:
+            with telemetry.span("llm.generate", purpose="goal", prompt_chars=len(prompt)):
+                response_text = self.backend.generate(prompt)
+            if not response_text:
                 return "PrepareForBattle", "LLM response was empty. Defaulting to a safe goal."
-            cleaned_text = response.text.strip().replace("```json", "").replace("```", "")
+            cleaned_text = response_text.strip().replace("```json", "").replace("```", "")
             data = json.loads(cleaned_text)
             return data.get("goal", "PrepareForBattle"), data.get("justification", "LLM response was malformed.")
         except Exception as e:
+            telemetry.increment("llm_errors_total", purpose="goal", error=type(e).__name__)
             return "PrepareForBattle", f"LLM Error: {e}. Defaulting to a safe goal."
 
     def _create_reflection_prompt(self, world_state: WorldState, failed_plan: list[str], reason: str) -> str:
         """
-        Constructs the prompt for reflecting on a failure. This method is unchanged.
-        """
-        return f"""
-        You are the Sentient Guardian. Your plan has just failed.
-        **Current World State:** {json.dumps(world_state.state, indent=2)}
-        **The Plan that Failed:** {failed_plan}
-        **Reason for Failure:** {reason}
-        **Your Task:**
-        Provide a short, first-person internal monologue reflecting on why the plan failed and what you might do differently.
+        Constructs the prompt for reflecting on a failure.
         """
+        return self.prompt_builder.build_reflection_prompt(world_state, failed_plan, reason)
 
     def reflect_on_failure(self, world_state: WorldState, failed_plan: list[str], reason: str) -> str:
         """
-        Asks the LLM to analyze a failure. This method is unchanged.
+        Asks the LLM to analyze a failure.
         """
         prompt = self._create_reflection_prompt(world_state, failed_plan, reason)
         print("\n----- Asking LLM to reflect on failure... -----")
+        telemetry.increment("llm_calls_total", purpose="reflection")
         try:
-            response = self.client.models.generate_content(model=self.model_name, contents=prompt)
-            if not hasattr(response, 'text') or not response.text:
+            with telemetry.span("llm.generate", purpose="reflection", prompt_chars=len(prompt)):
+                response_text = self.backend.generate(prompt)
+            if not response_text:
                 return "I have failed, and my mind is blank. I cannot reflect."
-            return response.text.strip()
+            return response_text.strip()
         except Exception as e:
+            telemetry.increment("llm_errors_total", purpose="reflection", error=type(e).__name__)
             return f"I have failed, and an error prevents reflection: {e}"
\ No newline at end of file
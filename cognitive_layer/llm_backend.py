@@ -0,0 +1,222 @@
+# cognitive_layer/llm_backend.py
+
+import hashlib
+import json
+import os
+import random
+import re
+import time
+from typing import Callable, List, Optional
+
+import config
+
+
+class LLMBackendError(RuntimeError):
+    """Raised when a backend fails to produce a response for a prompt."""
+
+
+class LLMBackend:
+    """
+    The interface the CognitiveEngine talks to. A backend takes a finished prompt
+    and returns the raw response text; parsing stays in the engine.
+    """
+    def generate(self, prompt: str) -> str:
+        raise NotImplementedError
+
+
+class GeminiBackend(LLMBackend):
+    """Sends prompts to the live Google Gemini API."""
+    def __init__(self, api_key: str, model_name: str = config.GEMINI_MODEL_NAME):
+        if not api_key: raise ValueError("API key for Gemini is not set.")
+        # Imported here so offline backends work without the SDK installed.
+        from google import genai
+        self.client = genai.Client(api_key=api_key)
+        self.model_name = model_name
+
+    def generate(self, prompt: str) -> str:
+        response = self.client.models.generate_content(model=self.model_name, contents=prompt)
+        return getattr(response, 'text', None) or ""
+
+
+# --- Offline stand-in ---
+
+def _fixed_latency(rng: random.Random, params: dict) -> float:
+    return params.get("seconds", 0.0)
+
+def _uniform_latency(rng: random.Random, params: dict) -> float:
+    return rng.uniform(params.get("low", 0.0), params.get("high", 0.0))
+
+def _exponential_latency(rng: random.Random, params: dict) -> float:
+    mean = params.get("mean", 0.0)
+    return rng.expovariate(1.0 / mean) if mean > 0 else 0.0
+
+def _lognormal_latency(rng: random.Random, params: dict) -> float:
+    return rng.lognormvariate(params.get("mu", -1.0), params.get("sigma", 0.5))
+
+LATENCY_DISTRIBUTIONS: dict[str, Callable[[random.Random, dict], float]] = {
+    "fixed": _fixed_latency,
+    "uniform": _uniform_latency,
+    "exponential": _exponential_latency,
+    "lognormal": _lognormal_latency,
+}
+
+_RECOMMENDED_GOAL_PATTERN = re.compile(r"Recommended Goal:\s*(\w+)")
+
+def default_goal_rule(prompt: str) -> Optional[str]:
+    """Agrees with the local simulation's recommendation when the prompt carries one."""
+    match = _RECOMMENDED_GOAL_PATTERN.search(prompt)
+    if not match:
+        return None
+    return json.dumps({
+        "goal": match.group(1),
+        "justification": "Stand-in advisor: adopting the local simulation's recommendation."
+    })
+
+def default_reflection_rule(prompt: str) -> Optional[str]:
+    """Produces a canned monologue for failure-reflection prompts."""
+    if "Your plan has just failed" not in prompt:
+        return None
+    return "My plan fell apart. Next time I should pick an action with better odds of success."
+
+
+class StandInBackend(LLMBackend):
+    """
+    A local, deterministic replacement for the live LLM. Responses come from an
+    ordered list of rules (callables returning a response or None); the first rule
+    that answers wins, otherwise `default_response` is returned.
+
+    Latency is drawn from one of LATENCY_DISTRIBUTIONS and errors are injected at
+    `error_rate`, both from a seeded RNG so runs are reproducible.
+    """
+    def __init__(self,
+                 rules: Optional[List[Callable[[str], Optional[str]]]] = None,
+                 default_response: str = '{"goal": "PrepareForBattle", "justification": "Stand-in advisor default."}',
+                 latency: str = "fixed",
+                 latency_params: Optional[dict] = None,
+                 error_rate: float = 0.0,
+                 seed: Optional[int] = None,
+                 sleep: Callable[[float], None] = time.sleep):
+        if latency not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution '{latency}'. Choose from {sorted(LATENCY_DISTRIBUTIONS)}.")
+        self.rules = rules if rules is not None else [default_reflection_rule, default_goal_rule]
+        self.default_response = default_response
+        self.latency = latency
+        self.latency_params = latency_params or {}
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.sleep = sleep
+
+    def generate(self, prompt: str) -> str:
+        delay = LATENCY_DISTRIBUTIONS[self.latency](self.rng, self.latency_params)
+        if delay > 0:
+            self.sleep(delay)
+        if self.error_rate > 0 and self.rng.random() < self.error_rate:
+            raise LLMBackendError("Injected stand-in failure.")
+        for rule in self.rules:
+            response = rule(prompt)
+            if response is not None:
+                return response
+        return self.default_response
+
+
+# --- Record / replay ---
+
+def _prompt_key(prompt: str) -> str:
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+
+class RecordingBackend(LLMBackend):
+    """
+    Wraps another backend and appends every exchange to a JSON-lines file so a
+    live session can later be served by ReplayBackend.
+    """
+    def __init__(self, inner: LLMBackend, filepath: str):
+        self.inner = inner
+        self.filepath = filepath
+
+    def generate(self, prompt: str) -> str:
+        started = time.perf_counter()
+        error = None
+        response = ""
+        try:
+            response = self.inner.generate(prompt)
+            return response
+        except Exception as e:
+            error = str(e)
+            raise
+        finally:
+            record = {
+                "key": _prompt_key(prompt),
+                "prompt": prompt,
+                "response": response,
+                "error": error,
+                "latency": round(time.perf_counter() - started, 6),
+            }
+            with open(self.filepath, 'a') as f:
+                f.write(json.dumps(record) + "\n")
+
+
+class ReplayBackend(LLMBackend):
+    """
+    Serves responses captured by RecordingBackend. Prompts are matched by content
+    hash; unmatched prompts fall back to the recording order so a session with
+    slightly different prompts still replays. Recorded errors are re-raised, and
+    recorded latencies can optionally be reproduced.
+    """
+    def __init__(self, filepath: str, replay_latency: bool = False, sleep: Callable[[float], None] = time.sleep):
+        if not os.path.exists(filepath):
+            raise FileNotFoundError(f"No LLM recording found at {filepath}.")
+        self.records: List[dict] = []
+        with open(filepath, 'r') as f:
+            for line in f:
+                if line.strip():
+                    self.records.append(json.loads(line))
+        if not self.records:
+            raise ValueError(f"LLM recording at {filepath} is empty.")
+        self.by_key: dict[str, List[dict]] = {}
+        for record in self.records:
+            self.by_key.setdefault(record["key"], []).append(record)
+        self.replay_latency = replay_latency
+        self.sleep = sleep
+        self._cursor = 0
+        self._key_cursors: dict[str, int] = {}
+
+    def _next_record(self, prompt: str) -> dict:
+        key = _prompt_key(prompt)
+        matches = self.by_key.get(key)
+        if matches:
+            index = self._key_cursors.get(key, 0)
+            self._key_cursors[key] = index + 1
+            return matches[index % len(matches)]
+        record = self.records[self._cursor % len(self.records)]
+        self._cursor += 1
+        return record
+
+    def generate(self, prompt: str) -> str:
+        record = self._next_record(prompt)
+        if self.replay_latency and record.get("latency"):
+            self.sleep(record["latency"])
+        if record.get("error"):
+            raise LLMBackendError(f"Replayed error: {record['error']}")
+        return record["response"]
+
+
+def create_backend(kind: str, api_key: Optional[str] = None, seed: Optional[int] = None) -> LLMBackend:
+    """
+    Builds a backend by name: 'gemini', 'standin', 'record' (Gemini wrapped in a
+    recorder) or 'replay'. Stand-in and recording settings come from config.
+    """
+    if kind == "gemini":
+        return GeminiBackend(api_key)
+    if kind == "standin":
+        return StandInBackend(
+            latency=config.STANDIN_LATENCY,
+            latency_params=config.STANDIN_LATENCY_PARAMS,
+            error_rate=config.STANDIN_ERROR_RATE,
+            seed=seed,
+        )
+    if kind == "record":
+        return RecordingBackend(GeminiBackend(api_key), config.LLM_RECORDING_FILEPATH)
+    if kind == "replay":
+        return ReplayBackend(config.LLM_RECORDING_FILEPATH)
+    raise ValueError(f"Unknown LLM backend '{kind}'. Choose from gemini, standin, record, replay.")
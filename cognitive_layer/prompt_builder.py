@@ -0,0 +1,133 @@
+# cognitive_layer/prompt_builder.py
+
+import json
+import math
+from collections.abc import Mapping
+from string import Template
+from typing import Dict, List, Tuple
+
+import config
+from execution_layer.world_state import WorldState
+from strategy_layer import generate_dynamic_advice
+from planning_layer.domain_registry import get_available_goals
+
+# --- Precompiled templates ---
+# Each section is compiled once at import time and only substituted per call.
+
+_HEADER = Template(
+    "You are the strategic advisor for an autonomous dungeon guardian. "
+    "I am its local logic core. Mood: $mood."
+)
+_STATE = Template("State: $state")
+_PROPOSAL = Template("Local simulation proposal:\n- Recommended Goal: $goal\n- Reasoning: $reasoning")
+_NO_PROPOSAL = "Local simulation found no valid course of action."
+_ADVICE = Template("Situation: $advice")
+_BIASES = Template("Learned action biases ($mood): $biases")
+_FAILURES = Template("Recent failures:\n$failures")
+_GOAL_OPTIONS = Template("Goal options (precomputed plans):\n$options")
+_TASK = Template(
+    "Goals: $goals. Choose the best long-term goal; adopt my proposal if you agree. "
+    'Reply only with JSON: {"goal": "...", "justification": "..."}'
+)
+_REFLECTION = Template(
+    "You are the Sentient Guardian. Your plan has just failed.\n"
+    "State: $state\nFailed plan: $plan\nReason: $reason\n"
+    "Give a short, first-person internal monologue on why it failed and what to do differently."
+)
+
+# Higher numbers are trimmed first when a prompt is over budget. Sections with
+# priority 0 are always kept.
+SECTION_PRIORITIES = {
+    "header": 0,
+    "state": 0,
+    "proposal": 0,
+    "task": 0,
+    "goal_options": 0,
+    "advice": 1,
+    "biases": 2,
+    "failures": 3,
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """A cheap local token estimate (~4 characters per token), good enough for budgeting."""
+    return math.ceil(len(text) / 4)
+
+def compact_state(state: Mapping) -> str:
+    """Serializes a state (dict or snapshot) as single-line JSON with no padding."""
+    return json.dumps(dict(state), separators=(",", ":"))
+
+def _summarize_failures(failures: List[Dict]) -> str:
+    """Collapses repeated failure reasons into one line each, with a repeat count."""
+    counts: Dict[str, int] = {}
+    for event in failures:
+        reason = event.get("reason", "unknown")
+        counts[reason] = counts.get(reason, 0) + 1
+    return "\n".join(f"- {reason}" + (f" (x{count})" if count > 1 else "") for reason, count in counts.items())
+
+def _summarize_biases(mood_biases: Dict[str, float], limit: int = 4) -> str:
+    ranked = sorted(mood_biases.items(), key=lambda item: abs(item[1]), reverse=True)[:limit]
+    return ", ".join(f"{name}:{value:+.2f}" for name, value in ranked)
+
+
+class PromptBuilder:
+    """
+    Assembles LLM prompts from precompiled section templates and trims the
+    lowest-priority sections until the estimated token count fits the budget.
+    """
+    def __init__(self, token_budget: int = config.PROMPT_TOKEN_BUDGET, max_failures: int = config.PROMPT_MAX_FAILURES):
+        self.token_budget = token_budget
+        self.max_failures = max_failures
+
+    def _goal_sections(self, state: Dict, mood: str, failures: List[Dict], biases: Dict, local_proposal: Tuple | None, advice: str,
+                       goal_plans: Dict | None) -> List[Tuple[str, str]]:
+        sections = [("header", _HEADER.substitute(mood=mood))]
+        if advice:
+            sections.append(("advice", _ADVICE.substitute(advice=advice)))
+        sections.append(("state", _STATE.substitute(state=compact_state(state))))
+        if local_proposal:
+            local_goal, local_justification, _ = local_proposal
+            sections.append(("proposal", _PROPOSAL.substitute(goal=local_goal, reasoning=local_justification)))
+        else:
+            sections.append(("proposal", _NO_PROPOSAL))
+        mood_biases = biases.get(mood, {})
+        if mood_biases:
+            sections.append(("biases", _BIASES.substitute(mood=mood, biases=_summarize_biases(mood_biases))))
+        if failures:
+            sections.append(("failures", _FAILURES.substitute(failures=_summarize_failures(failures))))
+        if goal_plans:
+            options = "\n".join(f"- {name}: {goal_plan.describe()}" for name, goal_plan in goal_plans.items())
+            sections.append(("goal_options", _GOAL_OPTIONS.substitute(options=options)))
+            # With nothing left to do, offer the goals that are already met rather than an empty list.
+            goal_names = ([name for name, goal_plan in goal_plans.items() if goal_plan.actionable]
+                          or [name for name, goal_plan in goal_plans.items() if goal_plan.feasible]
+                          or list(goal_plans))
+        else:
+            goal_names = [goal.name for goal in get_available_goals()]
+        sections.append(("task", _TASK.substitute(goals=", ".join(goal_names))))
+        return sections
+
+    def _fit_to_budget(self, sections: List[Tuple[str, str]]) -> str:
+        prompt = "\n".join(text for _, text in sections)
+        trimmable = sorted({name for name, _ in sections if SECTION_PRIORITIES.get(name, 0) > 0},
+                           key=lambda name: SECTION_PRIORITIES[name], reverse=True)
+        for name in trimmable:
+            if estimate_tokens(prompt) <= self.token_budget:
+                break
+            sections = [section for section in sections if section[0] != name]
+            prompt = "\n".join(text for _, text in sections)
+        return prompt
+
+    def build_goal_prompt(self, world_state: WorldState, recent_failures: List[Dict], mood: str, biases: Dict, local_proposal: Tuple | None,
+                          goal_plans: Dict | None = None) -> str:
+        """
+        Builds the goal-selection prompt. Past failures are trimmed first, then
+        learned biases, then the mood advice; state, proposal, goal options and
+        task always stay. With `goal_plans`, only goals that have a plan are offered.
+        """
+        advice = generate_dynamic_advice(mood, world_state)
+        sections = self._goal_sections(world_state.state, mood, recent_failures[-self.max_failures:], biases, local_proposal, advice, goal_plans)
+        return self._fit_to_budget(sections)
+
+    def build_reflection_prompt(self, world_state: WorldState, failed_plan: list[str], reason: str) -> str:
+        return _REFLECTION.substitute(state=compact_state(world_state.state), plan=" -> ".join(failed_plan), reason=reason)
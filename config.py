@@ -9,4 +9,55 @@ HEAL_AMOUNT = 50
 # Controls how quickly the agent's biases change. A smaller number means slower, more stable learning.
 LEARNING_RATE = 0.1
 # The confidence level the local decision engine must have to AVOID calling the LLM.
-CONFIDENCE_THRESHOLD = 0.5
\ No newline at end of file
+CONFIDENCE_THRESHOLD = 0.5
+# Which LLM backend the Cognitive Engine uses: "gemini", "standin", "record" or "replay".
+# Can be overridden with the LLM_BACKEND environment variable.
+LLM_BACKEND = "gemini"
+# Offline stand-in settings. Latency is one of "fixed", "uniform", "exponential", "lognormal".
+STANDIN_LATENCY = "fixed"
+STANDIN_LATENCY_PARAMS = {"seconds": 0.0}
+STANDIN_ERROR_RATE = 0.0
+STANDIN_SEED = None
+# Where "record" mode writes LLM exchanges and "replay" mode reads them back.
+LLM_RECORDING_FILEPATH = "llm_recording.jsonl"
+# Estimated-token budget for goal prompts; lower-priority sections are trimmed to fit.
+PROMPT_TOKEN_BUDGET = 300
+# How many recent failures the goal prompt may mention.
+PROMPT_MAX_FAILURES = 5
+
+# Lookahead search used by the local decision simulator.
+LOOKAHEAD_DEPTH = 3             # How many actions ahead to look.
+LOOKAHEAD_NODE_BUDGET = 3000    # Max simulated steps per decision.
+LOOKAHEAD_TIME_BUDGET = None    # Optional max seconds per decision. None: nodes only, so seeded runs repeat exactly.
+LOOKAHEAD_EXPLORATION = 10.0    # UCB exploration constant, in reward units.
+LOOKAHEAD_DISCOUNT = 0.9        # Weight of each further step's reward.
+LOOKAHEAD_TABLE_LIMIT = 50000   # Transposition table entries kept across cycles.
+
+# Seed for the agent's action-outcome RNG stream. None gives a different run every time.
+RANDOM_SEED = None
+
+# Number of simulated executions the plan evaluator runs per plan.
+PLAN_EVAL_ROLLOUTS = 100000
+
+# How the planner weighs actions: "deterministic" (fixed cost), "expected" (cost
+# including expected retries) or "risk_adjusted" (expected cost plus a variance penalty).
+PLANNER_COST_MODEL = "expected"
+# Only used by "risk_adjusted": how many standard deviations of retry cost to add.
+PLANNER_RISK_AVERSION = 0.5
+# Safety limit on A* node expansions per search, so an impossible goal can't loop forever.
+PLANNER_MAX_ITERATIONS = 1000
+
+# The declarative action/goal definitions, relative to the project root.
+DOMAIN_FILEPATH = "domain.json"
+# Re-read the domain file when it changes on disk (costs one stat() per lookup).
+DOMAIN_HOT_RELOAD = False
+
+# Macro-actions learned from successful plans in memory.
+MACRO_MAX_ACTIONS = 3   # Most macros injected into the planner's action set.
+MACRO_MIN_SUPPORT = 2   # Times a sequence must appear in successful plans.
+MACRO_MAX_LENGTH = 4    # Longest sequence considered.
+
+# Tracing and metrics (see telemetry.py). Can be overridden with the TRACE_ENABLED environment variable.
+TRACE_ENABLED = False
+TRACE_FILEPATH = "agent_trace.jsonl"      # One JSON span per line, appended across runs.
+METRICS_FILEPATH = "agent_metrics.prom"   # Prometheus text snapshot, rewritten at the end of a run.
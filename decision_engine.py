@@ -7,8 +7,12 @@ from execution_layer.world_state import WorldState
 from memory import Memory
 from cognitive_layer.cognitive_engine import CognitiveEngine
 from strategy_layer import determine_agent_mood
-from learning_layer import load_biases, calculate_reward
-from planning_layer.action import get_available_actions
+from learning_layer import load_biases, BIAS_FILEPATH
+from planning_layer.domain_registry import get_available_actions, get_available_goals, get_goal_by_name
+from planning_layer.lookahead import LookaheadSearch
+from planning_layer.planner import GOAPPlanner, GoalPlan, plan_all_goals
+import config
+import telemetry
 
 def _get_goal_from_action(action_name: str) -> str:
     """Maps a recommended action back to a high-level goal."""
@@ -20,78 +24,142 @@ def _get_goal_from_action(action_name: str) -> str:
         return "Survive"
     return "ProtectTreasure"
 
-def choose_goal_via_simulation(mood: str, world_state: WorldState, biases: Dict) -> Tuple[str, str, float] | None:
+# Used to precompute goal plans when the caller has not already done so.
+_planner = GOAPPlanner(cost_model=config.PLANNER_COST_MODEL, risk_aversion=config.PLANNER_RISK_AVERSION)
+
+def choose_goal_via_simulation(mood: str, world_state: WorldState, biases: Dict, goal_plans: Dict[str, GoalPlan] | None = None,
+                               lookahead: LookaheadSearch | None = None) -> Tuple[str, str, float] | None:
     """
-    The 'Master Tactician' brain. It simulates one step into the future for all
-    achievable actions and chooses the one with the best predicted outcome.
+    The 'Master Tactician' brain. It runs a bounded lookahead search over the
+    stochastic outcomes of every achievable action and chooses the one with the
+    best expected discounted reward over the next few steps.
+
+    When `goal_plans` is given, only goals with a non-empty plan are proposed; if
+    the best action leads to none of them, the cheapest actionable goal is used.
+    Pass the agent's own `lookahead` to reuse its transposition table across
+    cycles; without one, a fresh search is used for this call only.
     """
-    current_state_dict = world_state.state
-    achievable_actions = [action for action in get_available_actions() if action.is_achievable(current_state_dict)]
+    lookahead = lookahead or LookaheadSearch(seed=config.RANDOM_SEED)
+    ranked_actions = lookahead.search(world_state.snapshot(), get_available_actions())
 
-    if not achievable_actions:
+    if not ranked_actions and goal_plans is None:
         return None
 
-    simulation_results = []
-    for action in achievable_actions:
-        # Simulate the action's effect
-        hypothetical_next_state = action.apply(current_state_dict)
-        # Calculate the reward for this hypothetical outcome
-        reward = calculate_reward(current_state_dict, hypothetical_next_state)
-        # Use learned biases as a tie-breaker or small influence
-        # A small multiplier ensures simulation reward is more important than old biases
-        reward += biases.get(mood, {}).get(action.name, 0.0) * 0.1 
-        
-        simulation_results.append({"action": action.name, "reward": reward})
+    # Use learned biases as a tie-breaker or small influence
+    # A small multiplier ensures simulation reward is more important than old biases
+    mood_biases = biases.get(mood, {})
+    for result in ranked_actions:
+        result["reward"] = result["value"] + mood_biases.get(result["action"], 0.0) * 0.1
 
     # Sort results to find the best simulated outcome
-    simulation_results.sort(key=lambda x: x['reward'], reverse=True)
-    best_simulation = simulation_results[0]
-    
-    # Confidence is no longer the primary mechanism, but we can keep it for logging
-    confidence = 1.0 
+    ranked_actions.sort(key=lambda x: x['reward'], reverse=True)
+    total_visits = sum(result["visits"] for result in ranked_actions)
 
-    goal = _get_goal_from_action(best_simulation["action"])
+    for rank, simulation in enumerate(ranked_actions):
+        goal = _get_goal_from_action(simulation["action"])
+        if goal_plans is not None and not (goal in goal_plans and goal_plans[goal].actionable):
+            continue
+        # Confidence is the share of the search effort spent confirming the chosen action
+        confidence = simulation["visits"] / total_visits
+        if rank == 0:
+            justification = (
+                f"Local simulation recommends '{goal}' because action '{simulation['action']}' "
+                f"is predicted to yield the highest expected reward of {simulation['reward']:.2f} "
+                f"over the next {lookahead.depth} steps."
+            )
+        else:
+            best = ranked_actions[0]
+            best_goal = _get_goal_from_action(best["action"])
+            best_status = goal_plans[best_goal].describe() if best_goal in goal_plans else "no plan"
+            justification = (
+                f"Local simulation recommends '{goal}' because action '{simulation['action']}' "
+                f"(expected reward {simulation['reward']:.2f} over the next {lookahead.depth} steps) is the best "
+                f"action whose goal still needs a plan; the top action '{best['action']}' ({best['reward']:.2f}) "
+                f"leads to '{best_goal}' ({best_status})."
+            )
+        return goal, justification, confidence
+
+    actionable = [goal_plan for goal_plan in goal_plans.values() if goal_plan.actionable]
+    if not actionable:
+        return None
+    cheapest = min(actionable, key=lambda goal_plan: goal_plan.cost)
     justification = (
-        f"Local simulation recommends '{goal}' because action '{best_simulation['action']}' "
-        f"is predicted to yield the highest immediate reward of {best_simulation['reward']:.2f}."
+        f"Local simulation recommends '{cheapest.goal_name}' because no promising action leads to "
+        f"another achievable goal, and its plan is the cheapest ({cheapest.describe()})."
     )
-    
-    return goal, justification, confidence
+    return cheapest.goal_name, justification, 0.0
 
-def make_goal_decision(world_state: WorldState, memory: Memory, cognitive_engine: CognitiveEngine) -> Tuple[str, str]:
+def make_goal_decision(world_state: WorldState, memory: Memory, cognitive_engine: CognitiveEngine,
+                       goal_plans: Dict[str, GoalPlan] | None = None,
+                       lookahead: LookaheadSearch | None = None,
+                       bias_filepath: str = BIAS_FILEPATH) -> Tuple[str, str]:
     """
     The Arbiter. Gets proposals from both the local simulator and the LLM,
     then makes a final, justified decision.
+
+    `goal_plans` are the precomputed plans for every goal (see plan_all_goals);
+    they are computed here if not supplied. Goals without a plan are never chosen.
     """
     mood = determine_agent_mood(world_state, memory)
-    biases = load_biases()
+    biases = load_biases(bias_filepath)
+    if goal_plans is None:
+        goal_plans = plan_all_goals(_planner, world_state.state, get_available_goals(), get_available_actions())
+
+    # Nothing to act on: neither model can pick a goal with a plan, so don't ask the LLM.
+    if not any(goal_plan.actionable for goal_plan in goal_plans.values()):
+        telemetry.increment("decisions_total", outcome="idle")
+        met = [goal_plan.goal_name for goal_plan in goal_plans.values() if goal_plan.satisfied]
+        if not met:
+            print(colored("--- Decision: No goal has a plan from this state. ---", "red"))
+            return None, "No goal is reachable from the current state."
+        goal_name = max(met, key=lambda name: get_goal_by_name(name).priority)
+        print(colored(f"--- Decision: Idle. Every reachable goal is already met; keeping '{goal_name}'. ---", "green"))
+        return goal_name, f"Every reachable goal is already met, so there is nothing to do; '{goal_name}' holds."
     
     # --- Path 1: Get the Local Simulation's Proposal ---
     print(colored("--- Running Local Simulation... ---", "yellow"))
-    local_proposal = choose_goal_via_simulation(mood, world_state, biases)
+    with telemetry.span("decide.local", mood=mood) as span:
+        local_proposal = choose_goal_via_simulation(mood, world_state, biases, goal_plans, lookahead)
+        span.set(goal=local_proposal[0] if local_proposal else None)
 
     if not local_proposal:
-        print(colored("Local simulation found no possible actions. Escalating to LLM.", "red"))
+        print(colored("Local simulation found no achievable goal. Escalating to LLM.", "red"))
+        telemetry.increment("decisions_total", outcome="llm_only")
         # Pass None to indicate no local proposal was possible
-        return cognitive_engine.generate_goal(world_state, memory, mood, biases, None)
+        llm_goal, llm_justification = cognitive_engine.generate_goal(world_state, memory, mood, biases, None, goal_plans)
+        llm_plan = goal_plans.get(llm_goal)
+        if llm_plan is None or not llm_plan.actionable:
+            cheapest = min((goal_plan for goal_plan in goal_plans.values() if goal_plan.actionable), key=lambda goal_plan: goal_plan.cost)
+            print(colored(f"--- Decision: LLM chose '{llm_goal}', which has no actionable plan. Using '{cheapest.goal_name}'. ---", "cyan", attrs=["bold"]))
+            return cheapest.goal_name, f"The cheapest goal with a plan ({cheapest.describe()})."
+        return llm_goal, llm_justification
 
     local_goal, local_justification, _ = local_proposal
     print(colored(f"Local Proposal: Goal '{local_goal}' | Reason: {local_justification}", "green"))
     
     # --- Path 2: Get the LLM's Proposal, informed by the local one ---
     print(colored("--- Consulting LLM Expert... ---", "yellow"))
-    llm_goal, llm_justification = cognitive_engine.generate_goal(world_state, memory, mood, biases, local_proposal)
+    llm_goal, llm_justification = cognitive_engine.generate_goal(world_state, memory, mood, biases, local_proposal, goal_plans)
 
     # --- Path 3: Arbitrate and Decide ---
     # Simple Case: Both models agree on the goal
     if local_goal == llm_goal:
         print(colored("--- Decision: Unanimous. Both models agree. ---", "green", attrs=["bold"]))
+        telemetry.increment("decisions_total", outcome="unanimous")
         # Use the LLM's more eloquent justification
         return llm_goal, llm_justification
     
+    # The LLM picked something the planner cannot act on. Keep the local choice.
+    llm_plan = goal_plans.get(llm_goal)
+    if llm_plan is None or not llm_plan.actionable:
+        print(colored(f"--- Decision: LLM chose '{llm_goal}', which has no actionable plan. Keeping the local proposal. ---", "cyan", attrs=["bold"]))
+        telemetry.increment("decisions_total", outcome="llm_overridden")
+        return local_goal, local_justification
+
     # Complex Case: Disagreement. For now, we will trust the LLM's strategic view.
     # A more advanced version could use a third LLM call to resolve the conflict.
     print(colored("--- Decision: Disagreement. Prioritizing LLM's strategic insight. ---", "cyan", attrs=["bold"]))
+    telemetry.increment("decisions_total", outcome="llm_preferred")
     final_justification = (
         f"There was a disagreement. My local simulation suggested '{local_goal}', but the "
         f"LLM provided a compelling strategic reason for '{llm_goal}'. I will follow the LLM's advice: \"{llm_justification}\""
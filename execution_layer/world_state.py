@@ -1,50 +1,153 @@
 # execution_layer/world_state.py
 
+from collections.abc import Mapping
 from typing import Optional
 
+
 class WorldState:
-    def __init__(self, initial_state: Optional[dict] = None):
+    """
+    The agent's view of the world, stored as a fixed-schema tuple of values.
+
+    Writes replace the tuple rather than mutating it, so `snapshot()` can hand out
+    the current tuple without copying: snapshots are immutable, hashable and never
+    see later changes (copy-on-write). `state` is such a snapshot, so writing to it
+    raises instead of silently doing nothing; change the world with `set` or
+    `apply_effects`.
+    """
+    SCHEMA = ("health", "stamina", "potionCount", "treasureThreatLevel", "enemyNearby", "isInSafeZone")
+    DEFAULTS = (100, 20, 1, "low", False, True)
+
+    # Logical (min, max) range for each numeric key, enforced after every update.
+    # None means that side is unbounded.
+    CLAMP_RANGES = {
+        "health": (0, 100),
+        "stamina": (0, None),
+        "potionCount": (0, None),
+    }
 
-        self.state = {
-            "health": 100,
-            "stamina": 20,
-            "potionCount": 1,
-            "treasureThreatLevel": "low",
-            "enemyNearby": False,
-            "isInSafeZone": True
-        }
+    _INDEX = {key: i for i, key in enumerate(SCHEMA)}
+
+    __slots__ = ("_values",)
+
+    def __init__(self, initial_state: Optional[dict] = None):
+        self._values = self.DEFAULTS
         if initial_state:
-            self.state.update(initial_state)
+            values = list(self.DEFAULTS)
+            for key, value in initial_state.items():
+                values[self._slot(key)] = value
+            self._values = tuple(values)
+
+    @classmethod
+    def _slot(cls, key: str) -> int:
+        index = cls._INDEX.get(key)
+        if index is None:
+            raise KeyError(f"'{key}' is not part of the WorldState schema {cls.SCHEMA}.")
+        return index
+
+    @property
+    def state(self) -> 'WorldStateSnapshot':
+        """A read-only view of the current state. Use `dict(...)` for a mutable copy."""
+        return self.snapshot()
 
     def get(self, key: str, default=None):
-        """Gets a value from the state dictionary, with an optional default."""
-        return self.state.get(key, default)
+        """Gets a value from the state, with an optional default."""
+        index = self._INDEX.get(key)
+        return default if index is None else self._values[index]
 
     def set(self, key: str, value):
-        """Sets a value in the state dictionary."""
-        self.state[key] = value
+        """Sets a value in the state."""
+        values = list(self._values)
+        values[self._slot(key)] = value
+        self._values = tuple(values)
 
     def apply_effects(self, effects: dict):
-
+        values = list(self._values)
         for key, value in effects.items():
+            index = self._slot(key)
             if isinstance(value, tuple) and len(value) == 2:
                 operator, operand = value
-                current_val = self.state.get(key, 0) 
                 if operator == '-':
-                    self.state[key] = current_val - operand
+                    values[index] -= operand
                 elif operator == '+':
-                    self.state[key] = current_val + operand
+                    values[index] += operand
             else:
-                self.state[key] = value
+                values[index] = value
         # Clamp values to logical ranges
-        if "health" in self.state:
-            self.state["health"] = max(0, min(100, self.state["health"]))
-        if "stamina" in self.state:
-            self.state["stamina"] = max(0, self.state["stamina"])
-        if "potionCount" in self.state:
-            self.state["potionCount"] = max(0, self.state["potionCount"])
+        for key, (low, high) in self.CLAMP_RANGES.items():
+            index = self._INDEX[key]
+            value = values[index]
+            if low is not None: value = max(low, value)
+            if high is not None: value = min(high, value)
+            values[index] = value
+        self._values = tuple(values)
+
+    def snapshot(self) -> 'WorldStateSnapshot':
+        """Returns an immutable view of the current state. O(1): no values are copied."""
+        return WorldStateSnapshot(self._values)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (WorldState, WorldStateSnapshot)):
+            return self._values == other._values
+        return NotImplemented
+
+    __hash__ = None  # Mutable; hash a snapshot instead.
 
     def __str__(self) -> str:
         """Provides a user-friendly string representation of the world state."""
-        import json
-        return json.dumps(self.state, indent=2)
\ No newline at end of file
+        return "\n".join(f"  {key}: {value}" for key, value in zip(self.SCHEMA, self._values))
+
+
+class WorldStateSnapshot(Mapping):
+    """
+    A frozen WorldState. Reads like a dict (get, [], items, ...), hashes and
+    compares by value, and can be turned back into a WorldState with `thaw()`.
+    """
+    __slots__ = ("_values", "_hash")
+
+    def __init__(self, values: tuple):
+        self._values = values
+        self._hash = None
+
+    def __getitem__(self, key: str):
+        return self._values[WorldState._slot(key)]
+
+    def get(self, key: str, default=None):
+        index = WorldState._INDEX.get(key)
+        return default if index is None else self._values[index]
+
+    def __iter__(self):
+        return iter(WorldState.SCHEMA)
+
+    def __len__(self) -> int:
+        return len(WorldState.SCHEMA)
+
+    def __contains__(self, key) -> bool:
+        return key in WorldState._INDEX
+
+    def to_dict(self) -> dict:
+        return dict(zip(WorldState.SCHEMA, self._values))
+
+    def copy(self) -> dict:
+        """A mutable dict copy, as `dict.copy` would give (see Action.apply)."""
+        return self.to_dict()
+
+    def thaw(self) -> WorldState:
+        """Returns a mutable WorldState starting from this snapshot, sharing its values."""
+        world_state = WorldState()
+        world_state._values = self._values
+        return world_state
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (WorldState, WorldStateSnapshot)):
+            return self._values == other._values
+        if isinstance(other, Mapping):
+            return dict(self) == dict(other)
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            self._hash = hash(self._values)
+        return self._hash
+
+    def __repr__(self) -> str:
+        return f"WorldStateSnapshot({self.to_dict()})"
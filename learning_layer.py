@@ -2,52 +2,48 @@
 
 import os
 import json
-from typing import List, Dict
+from typing import List, Dict, Mapping
 from config import LEARNING_RATE
 
 BIAS_FILEPATH = 'action_biases.json'
 
-def load_biases() -> Dict:
+# How much a one-unit change in each state key is worth when scoring an outcome.
+REWARD_WEIGHTS = {
+    "health": 1.5,       # Health change is the most important
+    "potionCount": 2.0,  # Reward for finding potions
+    "stamina": 0.5,      # Smaller reward for stamina change
+}
+
+def load_biases(filepath: str = BIAS_FILEPATH) -> Dict:
     """Loads action biases from the JSON file. Returns an empty dict if the file doesn't exist."""
-    if not os.path.exists(BIAS_FILEPATH):
+    if not os.path.exists(filepath):
         return {}
     try:
-        with open(BIAS_FILEPATH, 'r') as f:
+        with open(filepath, 'r') as f:
             return json.load(f)
     except (json.JSONDecodeError, IOError):
         return {}
 
-def save_biases(biases: Dict):
+def save_biases(biases: Dict, filepath: str = BIAS_FILEPATH):
     """Saves the action biases to the JSON file."""
-    with open(BIAS_FILEPATH, 'w') as f:
+    with open(filepath, 'w') as f:
         json.dump(biases, f, indent=4)
 
-def calculate_reward(state_before: Dict, state_after: Dict) -> float:
+def calculate_reward(state_before: Mapping, state_after: Mapping) -> float:
     """
     Calculates a reward score based on the change between two world states.
     A positive reward is good, a negative reward is bad.
     """
     reward = 0.0
-
-    # Reward/penalize based on health change (most important)
-    health_change = state_after.get('health', 0) - state_before.get('health', 0)
-    reward += health_change * 1.5
-
-    # Reward for finding potions
-    potion_change = state_after.get('potionCount', 0) - state_before.get('potionCount', 0)
-    reward += potion_change * 2.0
-
-    # Smaller reward for stamina change
-    stamina_change = state_after.get('stamina', 0) - state_before.get('stamina', 0)
-    reward += stamina_change * 0.5
-
+    for key, weight in REWARD_WEIGHTS.items():
+        reward += (state_after.get(key, 0) - state_before.get(key, 0)) * weight
     return reward
 
-def update_biases(mood: str, plan: List[str], reward: float):
+def update_biases(mood: str, plan: List[str], reward: float, filepath: str = BIAS_FILEPATH):
    
     if not plan: return # Do not learn from empty plans
 
-    biases = load_biases()
+    biases = load_biases(filepath)
     biases.setdefault(mood, {})
 
     for action_name in plan:
@@ -55,4 +51,4 @@ def update_biases(mood: str, plan: List[str], reward: float):
         new_bias = old_bias + (LEARNING_RATE * reward)
         biases[mood][action_name] = round(new_bias, 4) # Round for cleanliness
 
-    save_biases(biases)
\ No newline at end of file
+    save_biases(biases, filepath)
\ No newline at end of file
@@ -1,123 +1,203 @@
 # main.py
 
 import os
+import random
 import time
+from typing import Callable
 from dotenv import load_dotenv
 from termcolor import colored
 
 from cognitive_layer.cognitive_engine import CognitiveEngine
-from planning_layer.planner import GOAPPlanner
-from planning_layer.action import get_available_actions
-from planning_layer.goal import get_goal_by_name
+from cognitive_layer.llm_backend import create_backend
+from planning_layer.planner import GOAPPlanner, plan_all_goals
+from planning_layer.domain_registry import get_available_actions, get_available_goals
+from planning_layer.macro_actions import MacroLibrary, expand_plan
+from planning_layer.lookahead import LookaheadSearch
+from planning_layer.plan_evaluator import evaluate_plan
 from execution_layer.action_executor import execute_action
 from execution_layer.world_state import WorldState
 from memory import Memory
 import config
+import telemetry
 # --- FIX: Corrected import statement to include 'determine_agent_mood' ---
 from strategy_layer import get_scenario_world_state, determine_agent_mood
 from decision_engine import make_goal_decision
-from learning_layer import calculate_reward, update_biases
+from learning_layer import calculate_reward, update_biases, BIAS_FILEPATH
 
-def run_simulation():
-    """
-    The main entry point for the Dungeon Guardian agent simulation.
+def run_episode(world_state: WorldState, memory: Memory, cognitive_engine: CognitiveEngine, planner: GOAPPlanner,
+                rng: random.Random, macro_library: MacroLibrary, max_cycles: int = 10,
+                lookahead: LookaheadSearch | None = None, bias_filepath: str = BIAS_FILEPATH,
+                sleep: Callable[[float], None] = time.sleep) -> dict:
     """
-    print("Booting up the Sentient Guardian...")
-    load_dotenv()
-    api_key = os.getenv("GEMINI_API_KEY")
-    if not api_key:
-        print(colored("FATAL: GEMINI_API_KEY not found. Shutting down.", "red"))
-        return
+    Runs the decide-plan-act-learn loop until a plan succeeds or `max_cycles` run out.
+    Pass `sleep=lambda _: None` to run without the pauses meant for a human watcher.
+    Without a `lookahead`, the episode gets its own, seeded from config.RANDOM_SEED.
 
-    memory = Memory(filepath='agent_memory.json')
-    cognitive_engine = CognitiveEngine(api_key=api_key)
-    planner = GOAPPlanner()
-    
-    # >> CHOOSE YOUR SCENARIO HERE BY CHANGING THE ID <<
-    world_state = get_scenario_world_state(scenario_id=4)
-    
-    max_cycles = 10
+    Returns:
+        A dict with 'succeeded', 'cycles', 'reward' (summed over cycles) and 'goal'.
+    """
     current_cycle = 0
+    total_reward = 0.0
+    goal_name = None
+    if lookahead is None:
+        lookahead = LookaheadSearch(seed=config.RANDOM_SEED)
 
     while current_cycle < max_cycles:
         current_cycle += 1
-        print(colored(f"\n==================== CYCLE {current_cycle} ====================", "white", "on_blue"))
+        telemetry.increment("cycles_total")
+        with telemetry.span("cycle", cycle=current_cycle) as cycle_span:
+            print(colored(f"\n==================== CYCLE {current_cycle} ====================", "white", "on_blue"))
         
-        state_before = world_state.state.copy()
-        print("\n--- Current World State ---")
-        print(world_state)
+            state_before = world_state.snapshot()
+            print("\n--- Current World State ---")
+            print(world_state)
 
-        # --- STEP 1: DECIDE ---
-        goal_name, justification = make_goal_decision(world_state, memory, cognitive_engine)
+            # --- STEP 1: PLAN FOR EVERY GOAL ---
+            # Knowing up front which goals are reachable keeps the decision away from dead ends.
+            with telemetry.span("plan"):
+                planning_actions = macro_library.augment(get_available_actions())
+                goal_plans = plan_all_goals(planner, world_state.state, get_available_goals(), planning_actions)
+
+            # --- STEP 2: DECIDE ---
+            with telemetry.span("decide") as decide_span:
+                goal_name, justification = make_goal_decision(world_state, memory, cognitive_engine, goal_plans,
+                                                              lookahead=lookahead, bias_filepath=bias_filepath)
+                decide_span.set(goal=goal_name)
+            cycle_span.set(goal=goal_name)
         
-        if not goal_name:
-            print(colored("\nAGENT STATUS: Confused. The decision engine failed to provide a goal.", "red"))
-            time.sleep(2)
-            continue
-
-        print("\n--- Agent's Internal Monologue ---")
-        print(colored(f"Goal Justification: \"{justification}\"", "cyan"))
-        print(colored(f"Chosen Goal: {goal_name}", "cyan", attrs=["bold"]))
-
-        selected_goal = get_goal_by_name(goal_name)
-        if not selected_goal:
-            print(colored(f"\nAGENT STATUS: Goal '{goal_name}' is invalid.", "red"))
-            continue
-
-        # --- STEP 2: PLAN ---
-        print("\n--- Planning ---")
-        plan = planner.find_plan(world_state.state, selected_goal.conditions, get_available_actions())
+            if not goal_name and not any(goal_plan.feasible for goal_plan in goal_plans.values()):
+                # Nothing can change the state, so every further cycle would end the same way.
+                print(colored("\nAGENT STATUS: Stuck. No goal is reachable from this state; ending the episode.", "red"))
+                break
+            if not goal_name:
+                print(colored("\nAGENT STATUS: Confused. The decision engine failed to provide a goal.", "red"))
+                sleep(2)
+                continue
+
+            print("\n--- Agent's Internal Monologue ---")
+            print(colored(f"Goal Justification: \"{justification}\"", "cyan"))
+            print(colored(f"Chosen Goal: {goal_name}", "cyan", attrs=["bold"]))
+
+            goal_plan = goal_plans.get(goal_name)
+            if not goal_plan:
+                print(colored(f"\nAGENT STATUS: Goal '{goal_name}' is invalid.", "red"))
+                continue
+
+            # --- STEP 3: PLAN (precomputed) ---
+            print("\n--- Planning ---")
+            plan = goal_plan.plan
+            if plan is not None:
+                plan = expand_plan(plan)
         
-        if not plan:
-            print(colored("Could not find a valid plan to achieve the goal. The agent will reconsider.", "red"))
-            memory.add_event({
-                "type": "failure",
-                "reason": f"Could not find a plan for goal '{goal_name}'.",
-                "plan": [], "world_state": world_state.state
-            })
-            time.sleep(2)
-            continue
-            
-        plan_names = [action.name for action in plan]
-        print(colored(f"Plan Found: {' -> '.join(plan_names)}", "magenta", attrs=["bold"]))
-
-        # --- STEP 3: ACT ---
-        print("\n--- Execution ---")
-        plan_succeeded = True
-        for action in plan:
-            success, reason = execute_action(action, world_state)
-            if not success:
-                # --- FIX: Restored full error handling and reflection logic ---
-                print(colored(f"Plan failed during execution of '{action.name}'.", "red"))
+            if plan is None:
+                print(colored("Could not find a valid plan to achieve the goal. The agent will reconsider.", "red"))
                 memory.add_event({
-                    "type": "failure", "reason": f"Action '{action.name}' failed: {reason}",
-                    "plan": plan_names, "world_state": world_state.state
+                    "type": "failure",
+                    "reason": f"Could not find a plan for goal '{goal_name}'.",
+                    "plan": [], "world_state": world_state.state.to_dict()
                 })
-                plan_succeeded = False
-                break # Stop executing the rest of the plan
-            time.sleep(1)
+                sleep(2)
+                continue
+            
+            plan_names = [action.name for action in plan]
+            print(colored(f"Plan Found: {' -> '.join(plan_names) or '(goal already met)'}", "magenta", attrs=["bold"]))
+            if plan:
+                with telemetry.span("evaluate", rollouts=config.PLAN_EVAL_ROLLOUTS) as evaluate_span:
+                    evaluation = evaluate_plan(plan, world_state, seed=config.RANDOM_SEED)
+                    evaluate_span.set(success_rate=evaluation.success_rate)
+                print(colored(f"Plan Outlook: {evaluation.success_rate:.0%} estimated success, "
+                              f"mean reward {evaluation.rewards.mean():.2f}", "magenta"))
+
+            # --- STEP 4: ACT ---
+            print("\n--- Execution ---")
+            plan_succeeded = True
+            for action in plan:
+                with telemetry.span("execute", action=action.name) as execute_span:
+                    success, reason = execute_action(action, world_state, rng)
+                    execute_span.set(success=success)
+                telemetry.increment("actions_executed_total", action=action.name, outcome="success" if success else "failure")
+                if not success:
+                    # --- FIX: Restored full error handling and reflection logic ---
+                    print(colored(f"Plan failed during execution of '{action.name}'.", "red"))
+                    memory.add_event({
+                        "type": "failure", "reason": f"Action '{action.name}' failed: {reason}",
+                        "plan": plan_names, "world_state": world_state.state.to_dict()
+                    })
+                    plan_succeeded = False
+                    break # Stop executing the rest of the plan
+                sleep(1)
+            cycle_span.set(plan_succeeded=plan_succeeded)
         
-        # --- STEP 4: LEARN & REFLECT ---
-        print("\n--- Learning & Reflection ---")
-        reward = calculate_reward(state_before, world_state.state)
-        # We need the mood here to correctly categorize the learned experience
-        mood = determine_agent_mood(world_state, memory)
-        update_biases(mood, plan_names, reward)
-        print(colored(f"Outcome analysis complete. Calculated reward: {reward:.2f}", "yellow"))
+            # --- STEP 5: LEARN & REFLECT ---
+            print("\n--- Learning & Reflection ---")
+            with telemetry.span("learn"):
+                reward = calculate_reward(state_before, world_state.snapshot())
+                # We need the mood here to correctly categorize the learned experience
+                mood = determine_agent_mood(world_state, memory)
+                update_biases(mood, plan_names, reward, bias_filepath)
+            total_reward += reward
+            print(colored(f"Outcome analysis complete. Calculated reward: {reward:.2f}", "yellow"))
         
-        # Only reflect on failure if an LLM call is available (to save quota)
-        if not plan_succeeded:
-            reflection = cognitive_engine.reflect_on_failure(world_state, plan_names, "Action failed during execution")
-            print(colored(f"\"{reflection}\"", "red"))
-
-        if plan_succeeded:
-            print(colored("\nAGENT STATUS: Plan executed successfully. Goal achieved.", "green"))
-            break # End simulation on success
+            # Only reflect on failure if an LLM call is available (to save quota)
+            if not plan_succeeded:
+                reflection = cognitive_engine.reflect_on_failure(world_state, plan_names, "Action failed during execution")
+                print(colored(f"\"{reflection}\"", "red"))
+
+            if plan_succeeded:
+                memory.add_event({
+                    "type": "success", "goal": goal_name,
+                    "plan": plan_names, "world_state": world_state.state.to_dict()
+                })
+                print(colored("\nAGENT STATUS: Plan executed successfully. Goal achieved.", "green"))
+                # Re-mine macros with this plan included, so later episodes with this library can use them.
+                macros = macro_library.learn(memory, get_available_actions())
+                if macros:
+                    print(f"--- Macro-actions now available: {', '.join(macro.name for macro in macros)} ---")
+                return {"succeeded": True, "cycles": current_cycle, "reward": total_reward, "goal": goal_name}
         
-        print("\nAgent will now re-evaluate the situation.")
-        time.sleep(3)
+            print("\nAgent will now re-evaluate the situation.")
+            sleep(3)
+
+    return {"succeeded": False, "cycles": current_cycle, "reward": total_reward, "goal": goal_name}
+
+def run_simulation():
+    """
+    The main entry point for the Dungeon Guardian agent simulation.
+    """
+    print("Booting up the Sentient Guardian...")
+    load_dotenv()
+    backend_kind = os.getenv("LLM_BACKEND", config.LLM_BACKEND)
+    api_key = os.getenv("GEMINI_API_KEY")
+    if backend_kind in ("gemini", "record") and not api_key:
+        print(colored("FATAL: GEMINI_API_KEY not found. Shutting down.", "red"))
+        return
+    if os.getenv("TRACE_ENABLED", str(config.TRACE_ENABLED)).lower() in ("1", "true", "yes"):
+        telemetry.configure(enabled=True)
+
+    memory = Memory(filepath='agent_memory.json')
+    cognitive_engine = CognitiveEngine(backend=create_backend(backend_kind, api_key=api_key, seed=config.STANDIN_SEED))
+    planner = GOAPPlanner(cost_model=config.PLANNER_COST_MODEL, risk_aversion=config.PLANNER_RISK_AVERSION)
+    rng = random.Random(config.RANDOM_SEED)
+    lookahead = LookaheadSearch(seed=config.RANDOM_SEED)  # This agent's own search tree and RNG
+    macro_library = MacroLibrary()
+    macros = macro_library.learn(memory, get_available_actions())
+    if macros:
+        print(f"--- Learned {len(macros)} macro-actions from memory: {', '.join(macro.name for macro in macros)} ---")
+    
+    # >> CHOOSE YOUR SCENARIO HERE BY CHANGING THE ID <<
+    world_state = get_scenario_world_state(scenario_id=4)
+    
+    with telemetry.span("simulation", backend=backend_kind) as simulation_span:
+        result = run_episode(world_state, memory, cognitive_engine, planner, rng, macro_library, max_cycles=10,
+                             lookahead=lookahead)
+        simulation_span.set(**result)
 
     print(colored("\n==================== SIMULATION END ====================", "white", "on_blue"))
+    tracer = telemetry.get_telemetry()
+    if tracer.enabled:
+        tracer.close()
+        print(tracer.summary())
+        print(f"Trace appended to {tracer.trace_filepath}; metrics written to {tracer.metrics_filepath}.")
 
 if __name__ == "__main__":
     run_simulation()
\ No newline at end of file
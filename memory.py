@@ -1,6 +1,7 @@
 import json
 import os
 from typing import List, Dict, Any
+import telemetry
 
 class Memory:
 
@@ -32,12 +33,13 @@ class Memory:
             event_data (dict): The dictionary containing event details.
         """
         print(f"--- MEMORY: Recording new event of type '{event_data.get('type')}' ---")
+        telemetry.increment("memory_events_total", type=event_data.get('type'))
         self.history.append(event_data)
         self.save()
 
     def save(self):
         try:
-            with open(self.filepath, 'w') as f:
+            with telemetry.span("memory.save", events=len(self.history)), open(self.filepath, 'w') as f:
                 json.dump(self.history, f, indent=4)
         except IOError as e:
             print(f"ERROR: Could not save memory file to {self.filepath}: {e}")
@@ -49,7 +51,7 @@ class Memory:
             return
 
         try:
-            with open(self.filepath, 'r') as f:
+            with telemetry.span("memory.load"), open(self.filepath, 'r') as f:
                 self.history = json.load(f)
             print(f"--- MEMORY: Successfully loaded {len(self.history)} events from {self.filepath}. ---")
         except (IOError, json.JSONDecodeError) as e:
@@ -61,6 +63,10 @@ class Memory:
         failures = [event for event in self.history if event.get('type') == 'failure']
         return failures[-n:]
 
+    def get_successful_plans(self) -> List[List[str]]:
+        """Returns the action-name sequences of every plan that was executed successfully."""
+        return [event.get('plan', []) for event in self.history if event.get('type') == 'success']
+
     def clear_memory(self):
         print("--- MEMORY: Clearing all memories. ---")
         self.history = []
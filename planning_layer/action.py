@@ -1,40 +1,91 @@
 # planning_layer/action.py
 
-from config import LOW_HEALTH_THRESHOLD, ATTACK_STAMINA_COST, HEAL_AMOUNT
+from types import MappingProxyType
+
+def conditions_met(conditions: dict, world_state: dict) -> bool:
+    """Checks a set of conditions (plain values or (op, operand) tuples) against a state."""
+    for key, value in conditions.items():
+        current_value = world_state.get(key)
+        
+        # This block handles complex preconditions like ('<', 30) or ('>=', 0)
+        if isinstance(value, tuple) and len(value) == 2:
+            op, operand = value
+            if current_value is None: return False # Cannot compare if the state key doesn't exist
+            if op == '>' and not (current_value > operand): return False
+            if op == '<' and not (current_value < operand): return False
+            if op == '>=' and not (current_value >= operand): return False
+            if op == '<=' and not (current_value <= operand): return False
+            if op == '==' and not (current_value == operand): return False
+            if op == '!=' and not (current_value != operand): return False
+        # This handles simple preconditions like {"enemyNearby": True}
+        elif current_value != value:
+            return False
+    return True
 
 class Action:
     """
     A base class for all actions in the GOAP system.
+
+    The agent's own actions are defined declaratively in domain.json and compiled
+    by planning_layer.domain_registry; subclasses can still define actions in code.
+    Compiled actions are shared by every caller, so the registry freezes them.
     """
-    def __init__(self):
-        """Initializes the action, setting its name and default cost."""
-        self.name = self.__class__.__name__
+    def __init__(self, name: str | None = None):
+        """Initializes the action, setting its name, default cost and outcome model."""
+        self.name = name or self.__class__.__name__
+        self.description = ""
         self.preconditions = {}
         self.effects = {}
         self.cost = 1  # Default cost for performing an action
 
+        # --- Outcome model used when the action is executed ---
+        self.success_probability = 1.0
+        self.risk_conditions = {}  # Failure is only possible while these hold (empty = always)
+        self.failure_effects = {}  # Applied to the world when the action fails
+        self.success_reason = f"{self.name} completed."
+        self.failure_reason = f"{self.name} failed."
+
+    def __setattr__(self, name, value):
+        if getattr(self, "_frozen", False):
+            raise AttributeError(f"Action '{self.name}' is frozen; cannot set '{name}'.")
+        object.__setattr__(self, name, value)
+
+    def freeze(self) -> 'Action':
+        """
+        Makes the action read-only: its condition and effect mappings become
+        MappingProxyType copies and no attribute can be reassigned. Returns self.
+        """
+        for name in ("preconditions", "effects", "risk_conditions", "failure_effects"):
+            object.__setattr__(self, name, MappingProxyType(dict(getattr(self, name))))
+        object.__setattr__(self, "_frozen", True)
+        return self
+
     def is_achievable(self, world_state: dict) -> bool:
         """
         Checks if the action's preconditions are met by the world state.
         This method can handle both simple equality and complex tuple-based comparisons.
         """
-        for key, value in self.preconditions.items():
-            current_value = world_state.get(key)
-            
-            # This block handles complex preconditions like ('<', 30) or ('>=', 0)
-            if isinstance(value, tuple) and len(value) == 2:
-                op, operand = value
-                if current_value is None: return False # Cannot compare if the state key doesn't exist
-                if op == '>' and not (current_value > operand): return False
-                if op == '<' and not (current_value < operand): return False
-                if op == '>=' and not (current_value >= operand): return False
-                if op == '<=' and not (current_value <= operand): return False
-                if op == '==' and not (current_value == operand): return False
-                if op == '!=' and not (current_value != operand): return False
-            # This handles simple preconditions like {"enemyNearby": True}
-            elif current_value != value:
-                return False
-        return True
+        return conditions_met(self.preconditions, world_state)
+
+    def get_success_probability(self, state: dict) -> float:
+        """Returns the chance this action succeeds from the given state."""
+        if self.risk_conditions and not conditions_met(self.risk_conditions, state):
+            return 1.0
+        return self.success_probability
+
+    def get_outcomes(self, state: dict) -> list[tuple[float, dict, bool]]:
+        """
+        Describes the possible results of executing this action from a given state.
+
+        Returns:
+            A list of (probability, effects, success_boolean) tuples summing to 1.
+        """
+        if not self.is_achievable(state):
+            return [(1.0, {}, False)]
+        p = self.get_success_probability(state)
+        if p >= 1.0:
+            return [(1.0, self.effects, True)]
+        return [(p, self.effects, True), (1.0 - p, self.failure_effects, False)]
 
     def apply(self, state: dict) -> dict:
         """
@@ -55,74 +106,3 @@ class Action:
             else:
                 new_state[key] = value
         return new_state
-
-
-# --- Define all specific actions for the agent ---
-
-class HealSelf(Action):
-    def __init__(self):
-        super().__init__()
-        self.preconditions = {"potionCount": ('>', 0)}
-        self.effects = {"health": ('+', HEAL_AMOUNT), "potionCount": ('-', 1)}
-
-class AttackEnemy(Action):
-    def __init__(self):
-        super().__init__()
-        self.preconditions = {"enemyNearby": True, "stamina": ('>=', ATTACK_STAMINA_COST)}
-        self.effects = {"enemyNearby": False, "stamina": ('-', ATTACK_STAMINA_COST)}
-        self.cost = 2 # Attacking is more costly than other actions
-
-class Retreat(Action):
-    def __init__(self):
-        super().__init__()
-        self.preconditions = {} # Can always attempt to retreat
-        self.effects = {"isInSafeZone": True, "enemyNearby": False}
-        
-class DefendTreasure(Action):
-    def __init__(self):
-        super().__init__()
-        self.preconditions = {} # Can always choose to defend
-        self.effects = {"treasureThreatLevel": "low"}
-        self.cost = 1
-
-class CallBackup(Action):
-    def __init__(self):
-        super().__init__()
-        self.preconditions = {"enemyNearby": True}
-        # Calling backup reduces immediate threat but might not eliminate it
-        self.effects = {"treasureThreatLevel": "low"} 
-        self.cost = 3 # Calling backup is a high-cost, last-resort action
-
-class SearchForPotion(Action):
-    def __init__(self):
-        super().__init__()
-        self.preconditions = {"isInSafeZone": True} # Only search when it's safe
-        self.effects = {"potionCount": ('+', 1)}
-        self.cost = 2
-
-class Rest(Action):
-    """
-    A low-cost, guaranteed action to recover health and stamina when safe.
-    This provides a fallback for the planner when no potions are available,
-    preventing planning loops where the goal is achievable but not guaranteed.
-    """
-    def __init__(self):
-        super().__init__()
-        self.preconditions = {"isInSafeZone": True}
-        self.effects = {"health": ('+', 10), "stamina": ('+', 5)}
-        self.cost = 1 # It's an easy, low-cost action to take.
-
-
-def get_available_actions() -> list[Action]:
-    """
-    Returns a list containing an instance of every available action for the agent.
-    """
-    return [
-        HealSelf(),
-        AttackEnemy(),
-        Retreat(),
-        DefendTreasure(),
-        CallBackup(),
-        SearchForPotion(),
-        Rest(),
-    ]
\ No newline at end of file
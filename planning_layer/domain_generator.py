@@ -0,0 +1,196 @@
+# planning_layer/domain_generator.py
+
+import random
+from typing import Dict, List, Optional, Tuple
+
+from planning_layer.action import Action, conditions_met
+from planning_layer.goal import Goal
+
+
+def validate_plan(plan: List[Action], start_state: dict, goal_conditions: dict) -> Tuple[bool, str]:
+    """
+    Replays a plan from `start_state`, checking every precondition along the way
+    and the goal at the end.
+
+    Returns:
+        A tuple of (valid_boolean, reason_string).
+    """
+    state = start_state
+    for index, action in enumerate(plan):
+        if not action.is_achievable(state):
+            return False, f"Step {index} ({action.name}): preconditions not met."
+        state = action.apply(state)
+    if not conditions_met(goal_conditions, state):
+        return False, "The plan ends without meeting the goal."
+    return True, "Valid plan."
+
+
+class PlanCheck:
+    """The result of checking a planner's answer against a synthetic domain's reference solution."""
+    def __init__(self, valid: bool, reason: str, cost: float, reference_cost: float):
+        self.valid = valid
+        self.reason = reason
+        self.cost = cost                      # Summed action cost of the checked plan (inf if invalid)
+        self.reference_cost = reference_cost  # Summed action cost of the reference plan
+
+    @property
+    def cost_ratio(self) -> float:
+        """Plan cost over the optimal (reference) cost: 1.0 is optimal."""
+        return self.cost / self.reference_cost
+
+
+class SyntheticDomain:
+    """
+    A generated planning problem: an action set, a start state, a goal and a
+    known optimal solution. Every step of the reference plan is the only way to
+    set one of the stage keys the goal depends on, so no plan can be cheaper.
+    """
+    def __init__(self, actions: List[Action], start_state: dict, goal: Goal, reference_plan: List[Action], seed: int):
+        self.actions = actions
+        self.start_state = start_state
+        self.goal = goal
+        self.reference_plan = reference_plan
+        self.seed = seed
+
+    @property
+    def reference_cost(self) -> float:
+        return sum(action.cost for action in self.reference_plan)
+
+    def check(self, plan: Optional[List[Action]]) -> PlanCheck:
+        """Checks a plan found by the planner. No plan at all counts as invalid, since a solution exists."""
+        if plan is None:
+            return PlanCheck(False, "No plan found for a solvable problem.", float("inf"), self.reference_cost)
+        valid, reason = validate_plan(plan, self.start_state, self.goal.conditions)
+        cost = sum(action.cost for action in plan) if valid else float("inf")
+        return PlanCheck(valid, reason, cost, self.reference_cost)
+
+    def to_dict(self) -> Dict:
+        """The domain in domain.json format, loadable with compile_domain(raw, schema=None)."""
+        def encode(mapping: dict) -> dict:
+            return {key: list(value) if isinstance(value, tuple) else value for key, value in mapping.items()}
+        return {
+            "actions": [
+                {"name": action.name, "cost": action.cost,
+                 "preconditions": encode(action.preconditions), "effects": encode(action.effects)}
+                for action in self.actions
+            ],
+            "goals": [{"name": self.goal.name, "priority": self.goal.priority, "conditions": encode(self.goal.conditions)}],
+        }
+
+
+def _holds_in(state: dict, keys: List[str]) -> Dict:
+    """Preconditions on `keys` that the given state satisfies."""
+    return {key: state[key] if isinstance(state[key], bool) else ('>=', state[key]) for key in keys}
+
+def _stage_gate(step: int) -> Dict:
+    """Preconditions that hold only between finishing step - 1 and finishing `step`."""
+    gate = {f"stage{step}": False}
+    if step:
+        gate[f"stage{step - 1}"] = True
+    return gate
+
+def _random_effects(rng: random.Random, keys: List[str], state: dict) -> Dict:
+    """
+    Numeric keys only ever increase, so the state space stays unbounded for the
+    planner and a "('>=', value)" condition, once met, stays met within its stage.
+    """
+    effects = {}
+    for key in keys:
+        if isinstance(state[key], bool):
+            effects[key] = not state[key]
+        else:
+            effects[key] = ('+', rng.randint(1, 5))
+    return effects
+
+def generate_domain(n_actions: int = 200, n_numeric: int = 20, n_boolean: int = 20, depth: int = 8,
+                    branching: int = 8, goal_size: int = 3, seed: int = 0) -> SyntheticDomain:
+    """
+    Builds a random but solvable GOAP problem.
+
+    A hidden solution of `depth` actions is laid down first. Step i is the only
+    action that sets "stage{i}" and it requires "stage{i-1}", so the steps must
+    all run, in order; each also changes a few ordinary keys. The goal asks for
+    the last stage plus values the chain reaches on the way. Step i and its
+    `branching - 1` distractors are gated on stage{i-1} being set and stage{i}
+    not yet, so each state on the chain has exactly `branching` applicable
+    actions. The rest of the `n_actions` are detours: gated on a random step in
+    the same way, but they also need a numeric key above its value on the
+    chain, so they only open up once the search wanders off the reference
+    solution, the way a large domain widens away from the obvious plan.
+
+    Args:
+        n_actions (int): Total number of actions, at least depth * branching.
+        n_numeric (int): Number of numeric state keys ("num0", "num1", ...).
+        n_boolean (int): Number of boolean state keys ("flag0", "flag1", ...), besides the stage keys.
+        depth (int): Length of the reference solution.
+        branching (int): How many actions are applicable in each state along the solution.
+        goal_size (int): Most conditions the goal has, including the final stage.
+        seed (int): The same seed always gives the same domain.
+
+    Returns:
+        A SyntheticDomain.
+    """
+    if depth < 1 or branching < 1 or n_numeric < 1 or n_numeric + n_boolean < 2:
+        raise ValueError("Need depth >= 1, branching >= 1, a numeric key and at least two state keys.")
+    if n_actions < depth * branching:
+        raise ValueError(f"n_actions must be at least depth * branching ({depth * branching}).")
+
+    rng = random.Random(seed)
+    numeric_keys = [f"num{index}" for index in range(n_numeric)]
+    keys = numeric_keys + [f"flag{index}" for index in range(n_boolean)]
+    start_state = {key: rng.randint(0, 10) for key in numeric_keys}
+    start_state.update({key: rng.random() < 0.5 for key in keys[n_numeric:]})
+    start_state.update({f"stage{step}": False for step in range(depth)})
+
+    # --- The hidden solution ---
+    reference_plan: List[Action] = []
+    distractors: List[Action] = []
+    chain_states = []  # The state before each step of the reference plan
+    state = start_state
+    for step in range(depth):
+        chain_states.append(state)
+        action = Action(name=f"Solve{step}")
+        action.preconditions = _holds_in(state, rng.sample(keys, rng.randint(0, 1)))
+        action.effects = _random_effects(rng, rng.sample(keys, rng.randint(1, 2)), state)
+        action.preconditions.update(_stage_gate(step))
+        action.effects[f"stage{step}"] = True
+        action.cost = rng.randint(1, 3)
+        reference_plan.append(action)
+
+        # Distractors that compete with this step, and only this step: the stage
+        # gate keeps them from piling up in earlier or later states.
+        for _ in range(branching - 1):
+            distractor = Action(name=f"Distract{len(distractors)}")
+            distractor.preconditions = _holds_in(state, rng.sample(keys, rng.randint(1, 2)))
+            distractor.preconditions.update(_stage_gate(step))
+            distractor.effects = _random_effects(rng, rng.sample(keys, rng.randint(1, 2)), state)
+            distractor.cost = rng.randint(1, 5)
+            distractors.append(distractor)
+
+        state = action.apply(state)
+
+    # --- The goal: the last stage, plus values the chain reaches ---
+    changed = [key for key in keys if state[key] != start_state[key]]
+    goal_keys = rng.sample(changed, max(0, min(goal_size - 1, len(changed))))
+    conditions = _holds_in(state, goal_keys)
+    conditions[f"stage{depth - 1}"] = True
+    goal = Goal(name="SyntheticGoal", priority=0, conditions=conditions)
+
+    # --- Detours: applicable only off the chain, after some numeric key has grown ---
+    for index in range(n_actions - depth * branching):
+        detour = Action(name=f"Detour{index}")
+        step = rng.randrange(depth)
+        key = rng.choice(numeric_keys)
+        detour.preconditions = {key: ('>=', chain_states[step][key] + rng.randint(1, 5))}
+        detour.preconditions.update(_stage_gate(step))
+        detour.effects = _random_effects(rng, rng.sample(keys, rng.randint(1, 2)), chain_states[step])
+        detour.cost = rng.randint(1, 5)
+        distractors.append(detour)
+
+    actions = reference_plan + distractors
+    rng.shuffle(actions)
+    domain = SyntheticDomain(actions, start_state, goal, reference_plan, seed)
+    valid, reason = validate_plan(reference_plan, start_state, goal.conditions)
+    if not valid or goal.is_fulfilled(start_state):
+        raise RuntimeError(f"Generated an invalid domain (seed {seed}): {reason}")
+    return domain
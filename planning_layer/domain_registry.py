@@ -0,0 +1,200 @@
+# planning_layer/domain_registry.py
+
+import json
+import os
+from string import Template
+from types import MappingProxyType
+from typing import Any, Dict, List, Optional, Tuple
+
+import config
+from planning_layer.action import Action
+from planning_layer.goal import Goal
+from execution_layer.world_state import WorldState
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CONDITION_OPERATORS = ('>', '<', '>=', '<=', '==', '!=')
+EFFECT_OPERATORS = ('+', '-')
+
+_ACTION_FIELDS = {
+    "name", "description", "cost", "preconditions", "effects", "success_probability",
+    "risk_conditions", "failure_effects", "success_reason", "failure_reason",
+}
+_GOAL_FIELDS = {"name", "priority", "conditions"}
+
+
+class DomainError(ValueError):
+    """Raised when a domain file is missing, malformed or fails validation."""
+
+
+class Domain:
+    """
+    The compiled, read-only set of actions and goals the agent works with.
+    Actions and goals are kept in file order and indexed by name for O(1) lookup.
+    """
+    def __init__(self, actions: Tuple[Action, ...], goals: Tuple[Goal, ...], source: str = ""):
+        self.actions = actions
+        self.goals = goals
+        self.source = source
+        self.actions_by_name = MappingProxyType({action.name: action for action in actions})
+        self.goals_by_name = MappingProxyType({goal.name: goal for goal in goals})
+
+    def get_action(self, name: str) -> Optional[Action]:
+        return self.actions_by_name.get(name)
+
+    def get_goal(self, name: str) -> Optional[Goal]:
+        return self.goals_by_name.get(name)
+
+
+# --- Compilation ---
+
+def _resolve(value: Any, where: str) -> Any:
+    """Resolves "$NAME" references to constants in config.py."""
+    if isinstance(value, str) and value.startswith("$"):
+        name = value[1:]
+        if not hasattr(config, name):
+            raise DomainError(f"{where}: unknown config reference '{value}'.")
+        return getattr(config, name)
+    return value
+
+def _compile_mapping(raw: Any, operators: Tuple[str, ...], schema: Optional[Tuple[str, ...]], where: str) -> MappingProxyType:
+    """Turns {"key": value | [op, operand]} into a frozen {key: value | (op, operand)} mapping."""
+    if not isinstance(raw, dict):
+        raise DomainError(f"{where}: expected an object, got {type(raw).__name__}.")
+    compiled = {}
+    for key, value in raw.items():
+        if schema is not None and key not in schema:
+            raise DomainError(f"{where}: '{key}' is not a world state key {schema}.")
+        if isinstance(value, list):
+            if len(value) != 2 or value[0] not in operators:
+                raise DomainError(f"{where}.{key}: expected [op, operand] with op in {operators}, got {value}.")
+            operand = _resolve(value[1], f"{where}.{key}")
+            if isinstance(operand, bool) or not isinstance(operand, (int, float)):
+                raise DomainError(f"{where}.{key}: operand must be a number, got {operand!r}.")
+            compiled[key] = (value[0], operand)
+        else:
+            compiled[key] = _resolve(value, f"{where}.{key}")
+    return MappingProxyType(compiled)
+
+def _reason(raw: Any, default: str, where: str) -> str:
+    if raw is None:
+        return default
+    try:
+        return Template(raw).substitute({name: getattr(config, name) for name in dir(config) if name.isupper()})
+    except (KeyError, ValueError) as e:
+        raise DomainError(f"{where}: bad reason template {raw!r}: {e}")
+
+def _compile_action(spec: Dict, schema: Optional[Tuple[str, ...]]) -> Action:
+    name = spec.get("name")
+    if not isinstance(name, str) or not name:
+        raise DomainError(f"Action without a valid name: {spec}.")
+    where = f"action '{name}'"
+    unknown = set(spec) - _ACTION_FIELDS
+    if unknown:
+        raise DomainError(f"{where}: unknown fields {sorted(unknown)}.")
+
+    action = Action(name=name)
+    action.description = spec.get("description", "")
+    action.cost = spec.get("cost", 1)
+    if isinstance(action.cost, bool) or not isinstance(action.cost, (int, float)) or action.cost <= 0:
+        raise DomainError(f"{where}: cost must be a positive number, got {action.cost!r}.")
+    action.preconditions = _compile_mapping(spec.get("preconditions", {}), CONDITION_OPERATORS, schema, f"{where}.preconditions")
+    action.effects = _compile_mapping(spec.get("effects", {}), EFFECT_OPERATORS, schema, f"{where}.effects")
+    action.success_probability = spec.get("success_probability", 1.0)
+    if not isinstance(action.success_probability, (int, float)) or not 0.0 <= action.success_probability <= 1.0:
+        raise DomainError(f"{where}: success_probability must be between 0 and 1.")
+    action.risk_conditions = _compile_mapping(spec.get("risk_conditions", {}), CONDITION_OPERATORS, schema, f"{where}.risk_conditions")
+    action.failure_effects = _compile_mapping(spec.get("failure_effects", {}), EFFECT_OPERATORS, schema, f"{where}.failure_effects")
+    action.success_reason = _reason(spec.get("success_reason"), action.success_reason, where)
+    action.failure_reason = _reason(spec.get("failure_reason"), action.failure_reason, where)
+    return action.freeze()
+
+def _compile_goal(spec: Dict, schema: Optional[Tuple[str, ...]]) -> Goal:
+    name = spec.get("name")
+    if not isinstance(name, str) or not name:
+        raise DomainError(f"Goal without a valid name: {spec}.")
+    where = f"goal '{name}'"
+    unknown = set(spec) - _GOAL_FIELDS
+    if unknown:
+        raise DomainError(f"{where}: unknown fields {sorted(unknown)}.")
+    conditions = _compile_mapping(spec.get("conditions", {}), CONDITION_OPERATORS, schema, f"{where}.conditions")
+    if not conditions:
+        raise DomainError(f"{where}: a goal needs at least one condition.")
+    return Goal(name=name, priority=spec.get("priority", 0), conditions=conditions)
+
+def _check_unique(names: List[str], kind: str):
+    seen = set()
+    for name in names:
+        if name in seen:
+            raise DomainError(f"Duplicate {kind} name '{name}'.")
+        seen.add(name)
+
+def compile_domain(raw: Dict, schema: Optional[Tuple[str, ...]] = WorldState.SCHEMA, source: str = "") -> Domain:
+    """
+    Validates a parsed domain definition and compiles it into a Domain. Pass
+    schema=None to allow state keys outside WorldState.SCHEMA.
+    """
+    if not isinstance(raw, dict) or not isinstance(raw.get("actions"), list) or not isinstance(raw.get("goals"), list):
+        raise DomainError("A domain needs top-level 'actions' and 'goals' lists.")
+    actions = tuple(_compile_action(spec, schema) for spec in raw["actions"])
+    goals = tuple(_compile_goal(spec, schema) for spec in raw["goals"])
+    _check_unique([action.name for action in actions], "action")
+    _check_unique([goal.name for goal in goals], "goal")
+    return Domain(actions, goals, source)
+
+def load_domain(filepath: str, schema: Optional[Tuple[str, ...]] = WorldState.SCHEMA) -> Domain:
+    """Loads, validates and compiles a domain file."""
+    try:
+        with open(filepath, 'r') as f:
+            raw = json.load(f)
+    except (IOError, json.JSONDecodeError) as e:
+        raise DomainError(f"Could not load domain file {filepath}: {e}")
+    return compile_domain(raw, schema, source=filepath)
+
+
+# --- The agent's active domain ---
+
+def _domain_path() -> str:
+    if os.path.isabs(config.DOMAIN_FILEPATH):
+        return config.DOMAIN_FILEPATH
+    return os.path.join(_PROJECT_ROOT, config.DOMAIN_FILEPATH)
+
+_active_domain: Optional[Domain] = None
+_active_mtime: Optional[float] = None
+
+def get_domain() -> Domain:
+    """
+    Returns the active domain, loading it on first use. With DOMAIN_HOT_RELOAD
+    enabled, the file is re-read whenever its modification time changes; a reload
+    that fails validation keeps the previous domain.
+    """
+    global _active_domain, _active_mtime
+    if _active_domain is not None and not config.DOMAIN_HOT_RELOAD:
+        return _active_domain
+
+    path = _domain_path()
+    mtime = os.path.getmtime(path)
+    if _active_domain is None or mtime != _active_mtime:
+        try:
+            domain = load_domain(path)
+        except DomainError as e:
+            if _active_domain is None:
+                raise
+            print(f"WARNING: Domain reload failed, keeping the previous domain. {e}")
+            domain = _active_domain
+        _active_domain, _active_mtime = domain, mtime
+    return _active_domain
+
+def get_available_actions() -> list[Action]:
+    """
+    Returns every action in the active domain. The actions are shared, compiled
+    instances, frozen so no caller can change them for the others; only the list
+    itself is new.
+    """
+    return list(get_domain().actions)
+
+def get_available_goals() -> list[Goal]:
+    return list(get_domain().goals)
+
+def get_goal_by_name(name: str) -> Goal | None:
+    return get_domain().get_goal(name)
@@ -0,0 +1,138 @@
+# planning_layer/lookahead.py
+
+import math
+import random
+import time
+from typing import Dict, List, Optional
+
+import config
+import telemetry
+from planning_layer.action import Action
+from execution_layer.world_state import WorldStateSnapshot
+from learning_layer import calculate_reward
+
+
+def _sample_outcome(outcomes: list, rng: random.Random) -> tuple:
+    roll = rng.random()
+    cumulative = 0.0
+    for outcome in outcomes:
+        cumulative += outcome[0]
+        if roll < cumulative:
+            return outcome
+    return outcomes[-1]
+
+def _apply_outcome(state: WorldStateSnapshot, effects: dict) -> WorldStateSnapshot:
+    """Applies effects with the same clamping the real world uses."""
+    if not effects:
+        return state
+    next_state = state.thaw()
+    next_state.apply_effects(effects)
+    return next_state.snapshot()
+
+
+class LookaheadSearch:
+    """
+    A bounded-depth Monte Carlo tree search over stochastic action outcomes.
+
+    Each iteration walks down from the root picking actions by UCB1, samples an
+    outcome from the action's outcome model, and backs the discounted reward up the path.
+    Statistics live in a transposition table keyed by (snapshot, remaining depth),
+    which is kept between calls so later cycles start from what was already learned.
+
+    The search is anytime: `search` can be called repeatedly to refine the estimate,
+    and `rank_actions` reports the current best guess at any point.
+    """
+    def __init__(self,
+                 depth: int = config.LOOKAHEAD_DEPTH,
+                 node_budget: int = config.LOOKAHEAD_NODE_BUDGET,
+                 time_budget: Optional[float] = config.LOOKAHEAD_TIME_BUDGET,
+                 exploration: float = config.LOOKAHEAD_EXPLORATION,
+                 discount: float = config.LOOKAHEAD_DISCOUNT,
+                 table_limit: int = config.LOOKAHEAD_TABLE_LIMIT,
+                 seed: Optional[int] = None):
+        self.depth = depth
+        self.node_budget = node_budget
+        self.time_budget = time_budget
+        self.exploration = exploration
+        self.discount = discount
+        self.table_limit = table_limit
+        self.rng = random.Random(seed)
+        # (snapshot, remaining_depth) -> {action_name: [visits, value_sum]}
+        self.table: Dict[tuple, Dict[str, List[float]]] = {}
+
+    def _select(self, entry: Dict[str, List[float]], actions: List[Action]) -> Action:
+        """Picks an untried action first, otherwise the one with the highest UCB1 score."""
+        for action in actions:
+            if action.name not in entry:
+                return action
+        total_visits = sum(entry[action.name][0] for action in actions)
+        log_total = math.log(total_visits)
+        best_action, best_score = actions[0], -math.inf
+        for action in actions:
+            visits, value_sum = entry[action.name]
+            score = value_sum / visits + self.exploration * math.sqrt(log_total / visits)
+            if score > best_score:
+                best_action, best_score = action, score
+        return best_action
+
+    def _rollout(self, root_state: WorldStateSnapshot, actions: List[Action]) -> int:
+        """Runs one iteration from the root. Returns the number of nodes expanded."""
+        path = []  # (entry, action_name, immediate_reward)
+        state = root_state
+        for remaining in range(self.depth, 0, -1):
+            achievable = [action for action in actions if action.is_achievable(state)]
+            if not achievable:
+                break
+            entry = self.table.setdefault((state, remaining), {})
+            action = self._select(entry, achievable)
+            _, effects, _ = _sample_outcome(action.get_outcomes(state), self.rng)
+            next_state = _apply_outcome(state, effects)
+            path.append((entry, action.name, calculate_reward(state, next_state)))
+            state = next_state
+
+        value = 0.0
+        for entry, action_name, reward in reversed(path):
+            value = reward + self.discount * value
+            stats = entry.setdefault(action_name, [0, 0.0])
+            stats[0] += 1
+            stats[1] += value
+        return len(path)
+
+    def search(self, state: WorldStateSnapshot, actions: List[Action], node_budget: Optional[int] = None, time_budget: Optional[float] = None) -> List[Dict]:
+        """
+        Spends up to `node_budget` simulated steps refining the estimates for
+        `state`, then returns the ranked root actions. A `time_budget` in seconds
+        also stops the search early, at the cost of results that depend on machine load.
+        """
+        node_budget = self.node_budget if node_budget is None else node_budget
+        time_budget = self.time_budget if time_budget is None else time_budget
+        if len(self.table) > self.table_limit:
+            self.table.clear()
+
+        deadline = math.inf if time_budget is None else time.perf_counter() + time_budget
+        nodes = 0
+        table_size = len(self.table)
+        while nodes < node_budget and time.perf_counter() < deadline:
+            expanded = self._rollout(state, actions)
+            if expanded == 0:
+                break
+            nodes += expanded
+        # Every simulated step either reused a table entry or added one.
+        misses = len(self.table) - table_size
+        telemetry.increment("lookahead_nodes_total", nodes)
+        telemetry.increment("lookahead_table_hits_total", nodes - misses)
+        telemetry.increment("lookahead_table_misses_total", misses)
+        return self.rank_actions(state)
+
+    def rank_actions(self, state: WorldStateSnapshot) -> List[Dict]:
+        """
+        Returns the root actions seen so far for `state`, best first, as dicts with
+        'action', 'value' (mean discounted return) and 'visits'.
+        """
+        entry = self.table.get((state, self.depth), {})
+        ranked = [
+            {"action": name, "value": value_sum / visits, "visits": visits}
+            for name, (visits, value_sum) in entry.items() if visits > 0
+        ]
+        ranked.sort(key=lambda result: result["value"], reverse=True)
+        return ranked
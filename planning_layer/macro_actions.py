@@ -0,0 +1,193 @@
+# planning_layer/macro_actions.py
+
+from typing import Dict, List, Optional, Tuple
+
+import config
+from planning_layer.action import Action, conditions_met
+from memory import Memory
+
+_LOWER_BOUNDS = ('>', '>=')
+_UPPER_BOUNDS = ('<', '<=')
+
+# Results of regressing a condition that don't reduce to a new condition.
+_GUARANTEED = object()
+_IMPOSSIBLE = object()
+
+
+# --- Composing actions ---
+
+def _delta(effect: tuple) -> float:
+    op, operand = effect
+    return operand if op == '+' else -operand
+
+def _is_relative(value) -> bool:
+    return isinstance(value, tuple) and len(value) == 2
+
+def _regress(key: str, condition, effects: Dict):
+    """
+    Rewrites a condition that must hold *after* `effects` into one on the state
+    *before* them. Returns _GUARANTEED if the effects make it hold and _IMPOSSIBLE
+    if they rule it out.
+    """
+    if key not in effects:
+        return condition
+    effect = effects[key]
+    if not _is_relative(effect):
+        return _GUARANTEED if conditions_met({key: condition}, {key: effect}) else _IMPOSSIBLE
+    delta = _delta(effect)
+    if _is_relative(condition):
+        op, operand = condition
+        return (op, operand - delta)
+    if isinstance(condition, bool) or not isinstance(condition, (int, float)):
+        return _IMPOSSIBLE
+    return condition - delta
+
+def _merge(key: str, existing, new):
+    """Combines two conditions on the same key into one, or returns None if that can't be expressed."""
+    if existing is None or existing == new:
+        return new
+    if not _is_relative(existing) and not _is_relative(new):
+        return None
+    if not _is_relative(existing) or not _is_relative(new):
+        value, condition = (existing, new) if not _is_relative(existing) else (new, existing)
+        return value if conditions_met({key: condition}, {key: value}) else None
+
+    (op_a, a), (op_b, b) = existing, new
+    if op_a in _LOWER_BOUNDS and op_b in _LOWER_BOUNDS:
+        # x > a and x >= b: whichever bound is higher wins; on a tie '>' is stricter.
+        if a != b:
+            return existing if a > b else new
+        return ('>', a) if '>' in (op_a, op_b) else existing
+    if op_a in _UPPER_BOUNDS and op_b in _UPPER_BOUNDS:
+        if a != b:
+            return existing if a < b else new
+        return ('<', a) if '<' in (op_a, op_b) else existing
+    return None
+
+def _compose_effects(effects: Dict, step_effects: Dict) -> Dict:
+    composed = dict(effects)
+    for key, effect in step_effects.items():
+        previous = composed.get(key)
+        if not _is_relative(effect) or previous is None:
+            composed[key] = effect
+        elif _is_relative(previous):
+            total = _delta(previous) + _delta(effect)
+            composed[key] = ('+', total) if total >= 0 else ('-', -total)
+        else:
+            composed[key] = previous + _delta(effect)
+    return composed
+
+def compose(steps: List[Action]) -> Optional[Tuple[Dict, Dict]]:
+    """
+    Folds a sequence of actions into a single (preconditions, effects) pair with
+    the same meaning for the planner. Returns None if the sequence can never run
+    or its preconditions can't be expressed as one condition per key.
+    """
+    preconditions: Dict = {}
+    effects: Dict = {}
+    for step in steps:
+        for key, condition in step.preconditions.items():
+            regressed = _regress(key, condition, effects)
+            if regressed is _GUARANTEED:
+                continue
+            if regressed is _IMPOSSIBLE:
+                return None
+            merged = _merge(key, preconditions.get(key), regressed)
+            if merged is None:
+                return None
+            preconditions[key] = merged
+        effects = _compose_effects(effects, step.effects)
+    return preconditions, effects
+
+
+class MacroAction(Action):
+    """
+    A fixed sequence of actions the planner can take as a single step. It has
+    the composed preconditions and effects of its steps and the sum of their costs.
+    Macros exist only for planning: expand them with `expand_plan` before execution.
+    """
+    def __init__(self, steps: List[Action], preconditions: Dict, effects: Dict):
+        super().__init__(name=f"Macro[{'>'.join(step.name for step in steps)}]")
+        self.steps = tuple(steps)
+        self.preconditions = preconditions
+        self.effects = effects
+        self.cost = sum(step.cost for step in steps)
+
+    def get_success_probability(self, state: dict) -> float:
+        """The chance that every step succeeds, following the state along the sequence."""
+        state = dict(state)  # Also accepts read-only Mappings such as WorldStateSnapshot
+        probability = 1.0
+        for step in self.steps:
+            probability *= step.get_success_probability(state)
+            state = step.apply(state)
+        return probability
+
+
+def expand_plan(plan: List[Action]) -> List[Action]:
+    """Replaces every macro in a plan with the primitive actions it stands for."""
+    expanded = []
+    for action in plan:
+        if isinstance(action, MacroAction):
+            expanded.extend(expand_plan(list(action.steps)))
+        else:
+            expanded.append(action)
+    return expanded
+
+
+# --- Learning macros from memory ---
+
+def mine_frequent_sequences(plans: List[List[str]], min_length: int = 2, max_length: int = 4,
+                            min_support: int = 2) -> List[Tuple[Tuple[str, ...], int]]:
+    """
+    Counts every contiguous action sequence of `min_length`..`max_length` steps in
+    the given plans and returns those seen at least `min_support` times, ranked by
+    how many planner steps they would have saved (occurrences x (length - 1)).
+    """
+    counts: Dict[Tuple[str, ...], int] = {}
+    for plan in plans:
+        for length in range(min_length, min(max_length, len(plan)) + 1):
+            for start in range(len(plan) - length + 1):
+                sequence = tuple(plan[start:start + length])
+                counts[sequence] = counts.get(sequence, 0) + 1
+    frequent = [(sequence, count) for sequence, count in counts.items() if count >= min_support]
+    frequent.sort(key=lambda item: (item[1] * (len(item[0]) - 1), len(item[0])), reverse=True)
+    return frequent
+
+
+class MacroLibrary:
+    """
+    Learns macro-actions from the successful plans in memory and adds them to the
+    planner's action set. At most `max_macros` are injected, so the planner's
+    branching factor stays bounded no matter how long the history grows.
+    """
+    def __init__(self,
+                 max_macros: int = config.MACRO_MAX_ACTIONS,
+                 min_support: int = config.MACRO_MIN_SUPPORT,
+                 max_length: int = config.MACRO_MAX_LENGTH):
+        self.max_macros = max_macros
+        self.min_support = min_support
+        self.max_length = max_length
+        self.macros: List[MacroAction] = []
+
+    def learn(self, memory: Memory, actions: List[Action]) -> List[MacroAction]:
+        """Rebuilds the macro set from memory, using `actions` to resolve action names."""
+        actions_by_name = {action.name: action for action in actions}
+        sequences = mine_frequent_sequences(memory.get_successful_plans(), max_length=self.max_length,
+                                            min_support=self.min_support)
+        macros = []
+        for sequence, _ in sequences:
+            if len(macros) >= self.max_macros:
+                break
+            if not all(name in actions_by_name for name in sequence):
+                continue
+            steps = [actions_by_name[name] for name in sequence]
+            composed = compose(steps)
+            if composed is None:
+                continue
+            macros.append(MacroAction(steps, *composed))
+        self.macros = macros
+        return macros
+
+    def augment(self, actions: List[Action]) -> List[Action]:
+        """Returns the given actions followed by the learned macros."""
+        return list(actions) + self.macros
@@ -0,0 +1,192 @@
+# planning_layer/plan_evaluator.py
+
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+import config
+from planning_layer.action import Action
+from planning_layer.macro_actions import expand_plan
+from execution_layer.world_state import WorldState
+from learning_layer import REWARD_WEIGHTS
+
+
+class PlanEvaluation:
+    """The aggregated result of many simulated executions of one plan."""
+    def __init__(self, plan_names: List[str], rollouts: int, success_rate: float, rewards: np.ndarray,
+                 failure_points: Dict[str, int], elapsed_ms: float):
+        self.plan_names = plan_names
+        self.rollouts = rollouts
+        self.success_rate = success_rate
+        self.rewards = rewards
+        self.failure_points = failure_points  # "step:ActionName" -> number of rollouts that stopped there
+        self.elapsed_ms = elapsed_ms
+
+    def reward_percentiles(self, percentiles=(5, 25, 50, 75, 95)) -> Dict[int, float]:
+        return dict(zip(percentiles, np.percentile(self.rewards, percentiles).tolist()))
+
+    def reward_histogram(self, bins: int = 10) -> Dict[str, list]:
+        counts, edges = np.histogram(self.rewards, bins=bins)
+        return {"counts": counts.tolist(), "bin_edges": edges.tolist()}
+
+    def summary(self) -> Dict:
+        """A JSON-friendly digest of the evaluation."""
+        return {
+            "plan": self.plan_names,
+            "rollouts": self.rollouts,
+            "success_rate": self.success_rate,
+            "reward_mean": float(self.rewards.mean()),
+            "reward_std": float(self.rewards.std()),
+            "reward_percentiles": self.reward_percentiles(),
+            "failure_points": self.failure_points,
+            "elapsed_ms": round(self.elapsed_ms, 3),
+        }
+
+
+class _Columns:
+    """
+    The batch of simulated world states, stored column-wise: one NumPy array per
+    state key with one row per rollout. Numbers and booleans are stored as floats,
+    strings as integer codes into a per-key vocabulary.
+    """
+    def __init__(self, start_state: dict, keys: set, rollouts: int):
+        self.vocab: Dict[str, Dict] = {}
+        self.types: Dict[str, type] = {}
+        self.arrays: Dict[str, np.ndarray] = {}
+        for key in keys:
+            value = start_state.get(key, 0)
+            if isinstance(value, str):
+                self.vocab[key] = {}
+            self.types[key] = type(value)
+            self.arrays[key] = np.full(rollouts, self.encode(key, value), dtype=np.float64)
+
+    def encode(self, key: str, value):
+        vocab = self.vocab.get(key)
+        if vocab is None:
+            return float(value)
+        return float(vocab.setdefault(value, len(vocab)))
+
+    def decode(self, key: str, code: float):
+        vocab = self.vocab.get(key)
+        if vocab is not None:
+            return next(value for value, index in vocab.items() if index == code)
+        if self.types[key] is bool:
+            return bool(code)
+        return int(code) if code.is_integer() else code
+
+    def distinct_states(self, rows: np.ndarray) -> List[tuple]:
+        """
+        Groups the selected rows by state. Returns (state dict, row mask) pairs;
+        rollouts that have not failed share one state, so this is usually a single group.
+        """
+        indices = np.flatnonzero(rows)
+        if not len(indices):
+            return []
+        keys = sorted(self.arrays)
+        first = indices[0]
+        if not any(((self.arrays[key] != self.arrays[key][first]) & rows).any() for key in keys):
+            return [({key: self.decode(key, self.arrays[key][first].item()) for key in keys}, rows.copy())]
+        matrix = np.stack([self.arrays[key][indices] for key in keys], axis=1)
+        groups, inverse = np.unique(matrix, axis=0, return_inverse=True)
+        result = []
+        for group, codes in enumerate(groups):
+            mask = np.zeros_like(rows)
+            mask[indices[inverse.ravel() == group]] = True
+            result.append(({key: self.decode(key, code) for key, code in zip(keys, codes.tolist())}, mask))
+        return result
+
+    def apply(self, state: dict, effects: dict, rows: np.ndarray):
+        """
+        Moves the selected rows, which all hold `state`, to the state after `effects`.
+        Every clamped key is clamped, even with no effects, like WorldState.apply_effects.
+        """
+        new_state = dict(state)
+        for key, value in effects.items():
+            if isinstance(value, tuple) and len(value) == 2:
+                op, operand = value
+                if op == '+':
+                    new_state[key] += operand
+                elif op == '-':
+                    new_state[key] -= operand
+            else:
+                new_state[key] = value
+        for key, (low, high) in WorldState.CLAMP_RANGES.items():
+            if key in new_state:
+                if low is not None: new_state[key] = max(low, new_state[key])
+                if high is not None: new_state[key] = min(high, new_state[key])
+        for key, value in new_state.items():
+            if value != state[key]:
+                self.arrays[key][rows] = self.encode(key, value)
+
+
+def _plan_keys(start_state: dict, plan: List[Action]) -> set:
+    keys = set(start_state) | set(REWARD_WEIGHTS)
+    for action in plan:
+        for part in (action.preconditions, action.effects, action.failure_effects, action.risk_conditions):
+            keys.update(part)
+    return keys
+
+
+def evaluate_plan(plan: List[Action], start_state: WorldState, rollouts: int = config.PLAN_EVAL_ROLLOUTS,
+                  seed: Optional[int] = None) -> PlanEvaluation:
+    """
+    Estimates how a plan will fare when executed, by running `rollouts` simulated
+    executions side by side. Each step draws from the same outcome model as
+    execute_action, `Action.get_outcomes`, asked once per distinct state rather
+    than once per rollout: a step fails outright if its preconditions no longer
+    hold, and a failure applies the failure effects and ends that rollout.
+
+    Args:
+        plan (list[Action]): The plan, as returned by GOAPPlanner.find_plan. Macros are expanded first.
+        start_state (WorldState): The world the plan will start from.
+        rollouts (int): How many executions to simulate.
+        seed (int): Seed for the rollout RNG, for reproducible estimates.
+
+    Returns:
+        A PlanEvaluation with the success rate, reward samples and failure points.
+    """
+    started = time.perf_counter()
+    # Macro-actions only carry a composed outcome model; simulate the steps they stand for.
+    plan = expand_plan(plan)
+    rng = np.random.default_rng(seed)
+    state = start_state.state
+    columns = _Columns(state, _plan_keys(state, plan), rollouts)
+    start_values = {key: columns.arrays[key].copy() for key in REWARD_WEIGHTS}
+
+    alive = np.ones(rollouts, dtype=bool)
+    failed_at = np.full(rollouts, -1, dtype=np.int64)
+
+    for step, action in enumerate(plan):
+        draws = rng.random(rollouts)
+        succeeded = np.zeros(rollouts, dtype=bool)
+        for group_state, rows in columns.distinct_states(alive):
+            if not action.is_achievable(group_state):
+                continue  # execute_action fails without touching the world
+            # Picks outcome i where draw falls in [p0 + ... + p(i-1), p0 + ... + pi), as `draw < p` does for two outcomes.
+            outcomes = action.get_outcomes(group_state)
+            bounds = np.cumsum([probability for probability, _, _ in outcomes])
+            picked = np.minimum(np.searchsorted(bounds, draws, side='right'), len(outcomes) - 1)
+            for index, (_, effects, success) in enumerate(outcomes):
+                selected = rows & (picked == index)
+                columns.apply(group_state, effects, selected)
+                if success:
+                    succeeded |= selected
+        failed_at[alive & ~succeeded] = step
+        alive = succeeded
+
+    rewards = np.zeros(rollouts)
+    for key, weight in REWARD_WEIGHTS.items():
+        rewards += (columns.arrays[key] - start_values[key]) * weight
+
+    counts = np.bincount(failed_at[failed_at >= 0], minlength=len(plan))
+    failure_points = {f"{step}:{action.name}": int(counts[step]) for step, action in enumerate(plan) if counts[step]}
+
+    return PlanEvaluation(
+        plan_names=[action.name for action in plan],
+        rollouts=rollouts,
+        success_rate=float(np.mean(failed_at < 0)),
+        rewards=rewards,
+        failure_points=failure_points,
+        elapsed_ms=(time.perf_counter() - started) * 1000,
+    )
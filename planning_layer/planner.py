@@ -1,11 +1,17 @@
 # planning_layer/planner.py
 import heapq
-from typing import Optional, List
+import math
+from typing import Dict, Optional, List
 from planning_layer.action import Action
+from planning_layer.goal import Goal
+import config
+import telemetry
+
+COST_MODELS = ("deterministic", "expected", "risk_adjusted")
 
 class Node:
     """A node in the A* search graph."""
-    def __init__(self, state: dict, parent: Optional['Node'], action: Optional[Action], g_cost: int, h_cost: int):
+    def __init__(self, state: dict, parent: Optional['Node'], action: Optional[Action], g_cost: float, h_cost: int):
         self.state = state
         self.parent = parent
         self.action = action
@@ -19,7 +25,53 @@ class Node:
 class GOAPPlanner:
     """
     A Goal-Oriented Action Planner using the A* search algorithm.
+
+    Edge costs depend on the cost model:
+    - "deterministic": the action's fixed `cost`.
+    - "expected": `cost / p`, the expected cost of retrying until the action
+      succeeds (p is its success probability from that state).
+    - "risk_adjusted": the expected cost plus `risk_aversion` times the standard
+      deviation of that retry cost, to steer away from high-variance actions.
     """
+    def __init__(self, cost_model: str = "deterministic", risk_aversion: float = 0.0,
+                 max_iterations: int = config.PLANNER_MAX_ITERATIONS):
+        if cost_model not in COST_MODELS:
+            raise ValueError(f"Unknown cost model '{cost_model}'. Choose from {COST_MODELS}.")
+        self.cost_model = cost_model
+        self.risk_aversion = risk_aversion
+        self.max_iterations = max_iterations  # Node expansions allowed per search
+        self.last_expansions = 0  # Nodes expanded by the most recent find_plan call
+
+    def _edge_cost(self, action: Action, state: dict) -> float:
+        """The cost of taking `action` from `state` under the planner's cost model."""
+        if self.cost_model == "deterministic":
+            return action.cost
+        steps = getattr(action, "steps", None)
+        if steps:
+            # A macro-action costs exactly what its steps would, so it never skews the search.
+            return self.score_plan(state, list(steps))
+        p = action.get_success_probability(state)
+        if p <= 0:
+            return math.inf
+        # Attempts until success are geometric: mean 1/p, standard deviation sqrt(1-p)/p.
+        cost = action.cost / p
+        if self.cost_model == "risk_adjusted":
+            cost += self.risk_aversion * action.cost * math.sqrt(1 - p) / p
+        return cost
+
+    def score_plan(self, start_state: dict, plan: List[Action]) -> float:
+        """Total cost of a plan under this planner's cost model, for ranking alternatives."""
+        total = 0.0
+        state = start_state
+        for action in plan:
+            total += self._edge_cost(action, state)
+            state = action.apply(state)
+        return total
+
+    def rank_plans(self, start_state: dict, plans: List[List[Action]]) -> List[List[Action]]:
+        """Orders candidate plans from cheapest to most expensive under this cost model."""
+        return sorted(plans, key=lambda plan: self.score_plan(start_state, plan))
+
     # --- THIS IS THE CORRECTED, SMARTER HEURISTIC ---
     def _calculate_heuristic(self, state: dict, goal_conditions: dict) -> int:
         """
@@ -71,14 +123,16 @@ class GOAPPlanner:
         
         heapq.heappush(open_list, start_node)
 
-        max_iterations = 1000 # Safety break to prevent true infinite loops
         iterations = 0
 
-        while open_list and iterations < max_iterations:
+        while open_list and iterations < self.max_iterations:
             iterations += 1
             current_node = heapq.heappop(open_list)
 
             if self._calculate_heuristic(current_node.state, goal_conditions) == 0:
+                self.last_expansions = iterations
+                telemetry.increment("planner_expansions_total", iterations)
+                telemetry.increment("planner_searches_total", outcome="found")
                 return self._reconstruct_plan(current_node)
             
             closed_set.add(frozenset(current_node.state.items()))
@@ -90,7 +144,10 @@ class GOAPPlanner:
                     if frozenset(successor_state.items()) in closed_set:
                         continue
 
-                    g_cost = current_node.g_cost + action.cost
+                    edge_cost = self._edge_cost(action, current_node.state)
+                    if edge_cost == math.inf:
+                        continue
+                    g_cost = current_node.g_cost + edge_cost
                     h_cost = self._calculate_heuristic(successor_state, goal_conditions)
                     
                     successor_node = Node(
@@ -103,7 +160,56 @@ class GOAPPlanner:
                     
                     heapq.heappush(open_list, successor_node)
         
-        if iterations >= max_iterations:
+        self.last_expansions = iterations
+        telemetry.increment("planner_expansions_total", iterations)
+        telemetry.increment("planner_searches_total", outcome="not_found")
+        if iterations >= self.max_iterations:
             print("PLANNER WARNING: Reached max iterations. The state space might be too large or the goal impossible.")
 
-        return None # No plan found
\ No newline at end of file
+        return None # No plan found
+
+
+class GoalPlan:
+    """The planner's answer for one goal, computed before the goal is chosen."""
+    def __init__(self, goal_name: str, plan: Optional[List[Action]], cost: float, expansions: int = 0):
+        self.goal_name = goal_name
+        self.plan = plan    # None if no plan exists, [] if the goal is already met
+        self.cost = cost    # Cost under the planner's cost model (inf if no plan)
+        self.expansions = expansions  # Nodes the search expanded for this goal
+
+    @property
+    def feasible(self) -> bool:
+        return self.plan is not None
+
+    @property
+    def satisfied(self) -> bool:
+        return self.plan is not None and not self.plan
+
+    @property
+    def actionable(self) -> bool:
+        """True if there is something to do for this goal: a non-empty plan exists."""
+        return bool(self.plan)
+
+    def describe(self) -> str:
+        if self.plan is None:
+            return "no plan"
+        if not self.plan:
+            return "already met"
+        return f"cost {self.cost:.1f}: {' -> '.join(action.name for action in self.plan)}"
+
+
+def plan_all_goals(planner: GOAPPlanner, start_state: dict, goals: List[Goal], actions: List[Action]) -> Dict[str, GoalPlan]:
+    """
+    Plans for every goal from the same start state, so the decision step knows
+    up front which goals are reachable and what they cost. The searches run one
+    after another: A* here is pure Python, so threads would only contend for the GIL.
+    """
+    goal_plans = {}
+    for goal in goals:
+        with telemetry.span("plan.goal", goal=goal.name) as span:
+            plan = planner.find_plan(start_state, goal.conditions, actions)
+            expansions = planner.last_expansions
+            cost = math.inf if plan is None else planner.score_plan(start_state, plan)
+            span.set(feasible=plan is not None, length=len(plan) if plan else 0, expansions=expansions)
+        goal_plans[goal.name] = GoalPlan(goal.name, plan, cost, expansions)
+    return goal_plans
@@ -1,6 +1,7 @@
 # strategy_layer.py
 
-from typing import List
+import random
+from typing import Dict, List
 from execution_layer.world_state import WorldState
 from memory import Memory
 import config
@@ -49,6 +50,26 @@ def get_scenario_world_state(scenario_id: int) -> WorldState:
     print(f"--- Loading Scenario {scenario_id}: {scenario['description']} ---")
     return WorldState(initial_state=scenario['state'])
 
+def generate_scenarios(count: int, seed: int = 0) -> Dict[int, Dict]:
+    """
+    Builds `count` random scenarios in the same format as SCENARIOS, numbered after
+    the predefined ones. The same seed always gives the same scenarios.
+    """
+    rng = random.Random(seed)
+    first_id = max(SCENARIOS) + 1
+    scenarios = {}
+    for offset in range(count):
+        state = {
+            "health": rng.randint(5, 100),
+            "enemyNearby": rng.random() < 0.5,
+            "potionCount": rng.randint(0, 2),
+            "treasureThreatLevel": rng.choice(["low", "medium", "high"]),
+            "stamina": rng.randint(0, 20),
+            "isInSafeZone": rng.random() < 0.5,
+        }
+        scenarios[first_id + offset] = {"description": f"Generated scenario (seed {seed}, #{offset}).", "state": state}
+    return scenarios
+
 # --- 2. ROBUST Mood Determination ---
 def determine_agent_mood(world_state: WorldState, memory: Memory) -> str:
     """
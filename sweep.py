@@ -0,0 +1,122 @@
+# sweep.py
+
+import argparse
+import contextlib
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List
+
+import config
+from cognitive_layer.cognitive_engine import CognitiveEngine
+from cognitive_layer.llm_backend import StandInBackend
+from execution_layer.world_state import WorldState
+from memory import Memory
+from planning_layer.lookahead import LookaheadSearch
+from planning_layer.macro_actions import MacroLibrary
+from planning_layer.planner import GOAPPlanner
+from strategy_layer import SCENARIOS, generate_scenarios
+from main import run_episode
+
+
+def run_headless(scenario_id: int, state: Dict, seed: int, max_cycles: int) -> Dict:
+    """
+    Runs one episode with no console output, no pauses and the offline stand-in
+    LLM. Memory and biases live in a throwaway directory, so runs never share
+    learned state with each other or with the real agent files. Everything
+    random is seeded and the lookahead has no time limit, so the same
+    scenario and seed always give the same result.
+    """
+    with tempfile.TemporaryDirectory() as workdir, open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        memory = Memory(filepath=os.path.join(workdir, 'agent_memory.json'))
+        cognitive_engine = CognitiveEngine(backend=StandInBackend(seed=seed, error_rate=config.STANDIN_ERROR_RATE))
+        planner = GOAPPlanner(cost_model=config.PLANNER_COST_MODEL, risk_aversion=config.PLANNER_RISK_AVERSION)
+        started = time.perf_counter()
+        result = run_episode(
+            WorldState(initial_state=state), memory, cognitive_engine, planner,
+            rng=random.Random(seed),
+            macro_library=MacroLibrary(),
+            max_cycles=max_cycles,
+            # No wall-clock budget: the search stops on its node budget, so results don't depend on machine load.
+            lookahead=LookaheadSearch(time_budget=None, seed=seed),
+            bias_filepath=os.path.join(workdir, 'action_biases.json'),
+            sleep=lambda _: None,
+        )
+        result["wall_time"] = time.perf_counter() - started
+    result["scenario_id"] = scenario_id
+    result["seed"] = seed
+    return result
+
+
+def _summarize(runs: List[Dict]) -> Dict:
+    successes = [run for run in runs if run["succeeded"]]
+    return {
+        "runs": len(runs),
+        "success_rate": len(successes) / len(runs),
+        "mean_cycles_to_goal": statistics.mean(run["cycles"] for run in successes) if successes else None,
+        "mean_reward": statistics.mean(run["reward"] for run in runs),
+        "mean_wall_time_ms": statistics.mean(run["wall_time"] for run in runs) * 1000,
+    }
+
+
+def run_sweep(scenarios: Dict[int, Dict], seeds: List[int], max_cycles: int, workers: int | None = None) -> Dict:
+    """Runs every scenario with every seed across a process pool and aggregates the results."""
+    tasks = [(scenario_id, scenario["state"], seed) for scenario_id, scenario in scenarios.items() for seed in seeds]
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_headless, scenario_id, state, seed, max_cycles) for scenario_id, state, seed in tasks]
+        runs = [future.result() for future in futures]
+    elapsed = time.perf_counter() - started
+
+    by_scenario: Dict[int, List[Dict]] = {}
+    for run in runs:
+        by_scenario.setdefault(run["scenario_id"], []).append(run)
+
+    return {
+        "settings": {"seeds": len(seeds), "max_cycles": max_cycles, "workers": workers or os.cpu_count(),
+                     "planner_cost_model": config.PLANNER_COST_MODEL},
+        "scenarios": {
+            scenario_id: {"description": scenarios[scenario_id]["description"], **_summarize(scenario_runs)}
+            for scenario_id, scenario_runs in sorted(by_scenario.items())
+        },
+        "overall": _summarize(runs),
+        "sweep_wall_time_s": round(elapsed, 3),
+    }
+
+
+def print_report(report: Dict):
+    print(f"{'ID':>4}  {'Success':>7}  {'Cycles':>6}  {'Reward':>8}  {'ms/run':>7}  Description")
+    rows = list(report["scenarios"].items()) + [("ALL", {**report["overall"], "description": ""})]
+    for scenario_id, row in rows:
+        cycles = f"{row['mean_cycles_to_goal']:.2f}" if row["mean_cycles_to_goal"] is not None else "-"
+        print(f"{scenario_id:>4}  {row['success_rate']:>7.1%}  {cycles:>6}  {row['mean_reward']:>8.2f}  "
+              f"{row['mean_wall_time_ms']:>7.1f}  {row['description']}")
+    print(f"\nSweep finished in {report['sweep_wall_time_s']}s.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run every scenario across many seeds, headless and in parallel.")
+    parser.add_argument("--seeds", type=int, default=20, help="Number of RNG seeds per scenario.")
+    parser.add_argument("--first-seed", type=int, default=0, help="First seed; seeds are consecutive.")
+    parser.add_argument("--generated", type=int, default=0, help="Random scenarios to add to the predefined ones.")
+    parser.add_argument("--max-cycles", type=int, default=10, help="Cycle limit per run.")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores).")
+    parser.add_argument("--output", default="sweep_report.json", help="Where to write the JSON report.")
+    args = parser.parse_args()
+
+    scenarios = {**SCENARIOS, **generate_scenarios(args.generated, seed=args.first_seed)}
+    seeds = list(range(args.first_seed, args.first_seed + args.seeds))
+    report = run_sweep(scenarios, seeds, args.max_cycles, args.workers)
+
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=4)
+    print_report(report)
+    print(f"Report written to {args.output}.")
+
+
+if __name__ == "__main__":
+    main()
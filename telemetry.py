@@ -0,0 +1,265 @@
+# telemetry.py
+
+import json
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional, Tuple
+
+import config
+
+# Upper bounds, in seconds, of the latency histogram buckets.
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+METRIC_PREFIX = "agent_"
+
+
+def _escape_label(value) -> str:
+    """Escapes a label value as the Prometheus text format requires: backslash, double quote and newline."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class _NullSpan:
+    """What span() returns while telemetry is disabled: entering and leaving it does nothing."""
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def set(self, **attributes):
+        pass
+
+_NULL_SPAN = _NullSpan()
+
+
+class Histogram:
+    """A cumulative-bucket latency histogram in the Prometheus style."""
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # The last slot is +Inf
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.total += value
+        self.count += 1
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+class Span:
+    """
+    One timed section of work. Spans nest per thread: a span opened while
+    another is active on the same thread becomes its child.
+    """
+    def __init__(self, telemetry: 'Telemetry', name: str, attributes: Dict, parent: Optional['Span'] = None):
+        self.telemetry = telemetry
+        self.name = name
+        self.attributes = attributes
+        self.span_id = telemetry._next_id()
+        self.parent = parent
+        self.parent_id: Optional[int] = None
+        self.start = 0.0
+        self._started = 0.0
+
+    def set(self, **attributes):
+        """Adds attributes once they are known, e.g. the goal chosen inside a 'decide' span."""
+        self.attributes.update(attributes)
+
+    def __enter__(self):
+        stack = self.telemetry._stack()
+        parent = self.parent or (stack[-1] if stack else None)
+        self.parent_id = parent.span_id if parent else None
+        stack.append(self)
+        self.start = time.time()
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.perf_counter() - self._started
+        self.telemetry._stack().pop()
+        if exc_type is not None:
+            self.attributes["error"] = f"{exc_type.__name__}: {exc}"
+        self.telemetry._finish_span(self, duration)
+        return False
+
+
+class Telemetry:
+    """
+    Collects spans, counters and latency histograms for the agent loop.
+
+    Spans are appended to a JSON-lines trace file as they finish, and every span
+    duration also feeds the 'span_duration_seconds' histogram. Counters and
+    histograms can be exported as a Prometheus text snapshot. While disabled,
+    every call returns immediately and nothing is recorded or written.
+    """
+    def __init__(self, enabled: bool = False, trace_filepath: str = config.TRACE_FILEPATH,
+                 metrics_filepath: str = config.METRICS_FILEPATH):
+        self.enabled = enabled
+        self.trace_filepath = trace_filepath
+        self.metrics_filepath = metrics_filepath
+        self.counters: Dict[Tuple[str, Tuple], float] = {}
+        self.histograms: Dict[Tuple[str, Tuple], Histogram] = {}
+        self.trace_id = uuid.uuid4().hex[:16]  # Tells runs apart in a shared trace file
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._ids = 0
+        self._trace_file = None
+
+    def _stack(self) -> List[Span]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _next_id(self) -> int:
+        with self._lock:
+            self._ids += 1
+            return self._ids
+
+    def _finish_span(self, span: Span, duration: float):
+        record = {
+            "trace_id": self.trace_id, "name": span.name, "span_id": span.span_id, "parent_id": span.parent_id,
+            "start": round(span.start, 6), "duration_ms": round(duration * 1000, 3),
+            "thread": threading.current_thread().name, "attributes": span.attributes,
+        }
+        line = json.dumps(record, default=str)
+        with self._lock:
+            self._observe("span_duration_seconds", duration, (("span", span.name),))
+            if self._trace_file is None:
+                self._trace_file = open(self.trace_filepath, 'a')
+            self._trace_file.write(line + "\n")
+
+    def _observe(self, name: str, value: float, labels: Tuple):
+        histogram = self.histograms.get((name, labels))
+        if histogram is None:
+            histogram = self.histograms[(name, labels)] = Histogram()
+        histogram.observe(value)
+
+    # --- Recording ---
+
+    def span(self, name: str, parent: Optional[Span] = None, **attributes):
+        """
+        Times a block: `with telemetry.span("plan", cycle=3): ...`. Pass `parent`
+        (from current_span) to nest a span started on another thread.
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return Span(self, name, attributes, parent)
+
+    def current_span(self) -> Optional[Span]:
+        """The innermost open span on this thread, if any."""
+        if not self.enabled:
+            return None
+        stack = self._stack()
+        return stack[-1] if stack else None
+
+    def increment(self, name: str, value: float = 1, **labels):
+        """Adds `value` to a counter, e.g. increment("llm_calls_total", purpose="goal")."""
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels):
+        """Records a value in a latency histogram."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._observe(name, value, tuple(sorted(labels.items())))
+
+    # --- Export ---
+
+    def prometheus_text(self) -> str:
+        """Counters and histograms in the Prometheus text exposition format."""
+        def label_text(labels: Tuple, extra: Tuple = ()) -> str:
+            pairs = [f'{key}="{_escape_label(value)}"' for key, value in labels + extra]
+            return "{" + ",".join(pairs) + "}" if pairs else ""
+
+        lines = []
+        with self._lock:
+            counters = sorted(self.counters.items())
+            histograms = sorted(self.histograms.items(), key=lambda item: item[0])
+        declared = set()
+        for (name, labels), value in counters:
+            if name not in declared:
+                lines.append(f"# TYPE {METRIC_PREFIX}{name} counter")
+                declared.add(name)
+            lines.append(f"{METRIC_PREFIX}{name}{label_text(labels)} {value:g}")
+        for (name, labels), histogram in histograms:
+            if name not in declared:
+                lines.append(f"# TYPE {METRIC_PREFIX}{name} histogram")
+                declared.add(name)
+            cumulative = 0
+            for bound, count in zip(histogram.buckets + (float("inf"),), histogram.counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                lines.append(f"{METRIC_PREFIX}{name}_bucket{label_text(labels, (('le', le),))} {cumulative}")
+            lines.append(f"{METRIC_PREFIX}{name}_sum{label_text(labels)} {histogram.total:.6f}")
+            lines.append(f"{METRIC_PREFIX}{name}_count{label_text(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def write_metrics(self, filepath: str | None = None):
+        """Writes the Prometheus text snapshot, replacing the previous one."""
+        if not self.enabled:
+            return
+        with open(filepath or self.metrics_filepath, 'w') as f:
+            f.write(self.prometheus_text())
+
+    def summary(self) -> str:
+        """A short human-readable breakdown of where span time went."""
+        with self._lock:
+            spans = [(dict(labels)["span"], histogram) for (name, labels), histogram in self.histograms.items()
+                     if name == "span_duration_seconds"]
+        spans.sort(key=lambda item: item[1].total, reverse=True)
+        lines = [f"{'Span':<28} {'Count':>6} {'Total ms':>10} {'Mean ms':>9}"]
+        for name, histogram in spans:
+            lines.append(f"{name:<28} {histogram.count:>6} {histogram.total * 1000:>10.1f} {histogram.mean * 1000:>9.2f}")
+        return "\n".join(lines)
+
+    def close(self):
+        """Flushes the trace file and writes the final metrics snapshot."""
+        if not self.enabled:
+            return
+        self.write_metrics()
+        with self._lock:
+            if self._trace_file is not None:
+                self._trace_file.close()
+                self._trace_file = None
+
+
+# The process-wide instance the agent's modules report to.
+_telemetry = Telemetry(enabled=config.TRACE_ENABLED)
+
+def get_telemetry() -> Telemetry:
+    return _telemetry
+
+def configure(enabled: bool, trace_filepath: str = config.TRACE_FILEPATH,
+              metrics_filepath: str = config.METRICS_FILEPATH) -> Telemetry:
+    """Replaces the process-wide instance, e.g. to turn tracing on for one run."""
+    global _telemetry
+    _telemetry.close()
+    _telemetry = Telemetry(enabled, trace_filepath, metrics_filepath)
+    return _telemetry
+
+def span(name: str, parent: Optional[Span] = None, **attributes):
+    return _telemetry.span(name, parent, **attributes)
+
+def current_span() -> Optional[Span]:
+    return _telemetry.current_span()
+
+def increment(name: str, value: float = 1, **labels):
+    _telemetry.increment(name, value, **labels)
+
+def observe(name: str, value: float, **labels):
+    _telemetry.observe(name, value, **labels)
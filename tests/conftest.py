@@ -0,0 +1,7 @@
+# tests/conftest.py
+
+import os
+import sys
+
+# The agent's modules are imported from the project root, as main.py does.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,161 @@
+# tests/test_invariants.py
+
+import random
+
+import pytest
+
+from cognitive_layer.llm_backend import LLMBackendError, RecordingBackend, ReplayBackend, StandInBackend
+from execution_layer.action_executor import execute_action
+from execution_layer.world_state import WorldState
+from learning_layer import calculate_reward
+from planning_layer.action import Action
+from planning_layer.domain_generator import generate_domain
+from planning_layer.domain_registry import DomainError, compile_domain, get_available_actions, load_domain
+from planning_layer.macro_actions import MacroAction, compose, expand_plan
+from planning_layer.plan_evaluator import evaluate_plan
+from telemetry import Telemetry
+
+
+def _action(name, preconditions=None, effects=None, cost=1):
+    action = Action(name=name)
+    action.preconditions = preconditions or {}
+    action.effects = effects or {}
+    action.cost = cost
+    return action
+
+def _domain(**action_fields):
+    action = {"name": "Rest", "effects": {"stamina": ["+", 5]}}
+    action.update(action_fields)
+    return {"actions": [action], "goals": [{"name": "Rested", "conditions": {"stamina": [">=", 10]}}]}
+
+
+# --- Domain registry ---
+
+def test_compile_domain_accepts_the_shipped_domain():
+    assert get_available_actions()
+
+@pytest.mark.parametrize("raw", [
+    {"actions": []},
+    _domain(cost=0),
+    _domain(effects={"stamina": ["*", 2]}),
+    _domain(preconditions={"mana": [">", 0]}),
+    _domain(preconditions={"stamina": [">", "$NO_SUCH_CONSTANT"]}),
+    _domain(success_probability=1.5),
+    _domain(colour="blue"),
+    {"actions": [{"name": "Rest"}, {"name": "Rest"}], "goals": []},
+    {"actions": [], "goals": [{"name": "Nothing", "conditions": {}}]},
+])
+def test_compile_domain_rejects_invalid_definitions(raw):
+    with pytest.raises(DomainError):
+        compile_domain(raw)
+
+def test_load_domain_rejects_malformed_json(tmp_path):
+    path = tmp_path / "domain.json"
+    path.write_text("{not json")
+    with pytest.raises(DomainError):
+        load_domain(str(path))
+
+def test_compiled_actions_are_frozen():
+    action = get_available_actions()[0]
+    with pytest.raises(AttributeError):
+        action.cost = 99
+    with pytest.raises(TypeError):
+        action.effects["health"] = 0
+
+
+# --- Macro-actions ---
+
+def test_compose_and_expand_round_trip():
+    retreat = _action("Retreat", {"enemyNearby": True}, {"enemyNearby": False, "isInSafeZone": True})
+    rest = _action("Rest", {"isInSafeZone": True}, {"stamina": ('+', 5)}, cost=2)
+    macro = MacroAction([retreat, rest], *compose([retreat, rest]))
+
+    assert expand_plan([macro]) == [retreat, rest]
+    assert macro.cost == 3
+    state = {"enemyNearby": True, "isInSafeZone": False, "stamina": 1}
+    assert macro.is_achievable(state)
+    assert macro.apply(state) == rest.apply(retreat.apply(state))
+
+def test_compose_rejects_sequences_that_cannot_run():
+    leave = _action("Leave", {}, {"isInSafeZone": False})
+    rest = _action("Rest", {"isInSafeZone": True}, {})
+    assert compose([leave, rest]) is None
+
+
+# --- Synthetic domains ---
+
+@pytest.mark.parametrize("seed", range(3))
+def test_synthetic_domain_accepts_its_reference_plan(seed):
+    domain = generate_domain(60, 6, 6, 4, 4, seed=seed)
+    check = domain.check(domain.reference_plan)
+    assert check.valid
+    assert check.cost_ratio == 1.0
+
+def test_synthetic_domain_rejects_missing_and_broken_plans():
+    domain = generate_domain(60, 6, 6, 4, 4, seed=0)
+    assert not domain.check(None).valid
+    assert not domain.check(list(reversed(domain.reference_plan))).valid
+
+def test_synthetic_domain_branching_along_the_reference_plan():
+    domain = generate_domain(seed=1)
+    state = domain.start_state
+    for step in domain.reference_plan:
+        assert sum(action.is_achievable(state) for action in domain.actions) == 8
+        state = step.apply(state)
+
+
+# --- LLM record / replay ---
+
+def test_replay_matches_recording(tmp_path):
+    path = str(tmp_path / "session.jsonl")
+    recorder = RecordingBackend(StandInBackend(seed=3), path)
+    prompts = ["Reply with JSON. Goals: Survive, ProtectTreasure.", "Your plan has just failed.", "Something else."]
+    recorded = [recorder.generate(prompt) for prompt in prompts]
+
+    replay = ReplayBackend(path)
+    assert [replay.generate(prompt) for prompt in prompts] == recorded
+
+def test_replay_reraises_recorded_errors(tmp_path):
+    path = str(tmp_path / "session.jsonl")
+    with pytest.raises(LLMBackendError):
+        RecordingBackend(StandInBackend(error_rate=1.0), path).generate("prompt")
+    with pytest.raises(LLMBackendError):
+        ReplayBackend(path).generate("prompt")
+
+
+# --- World state and plan evaluation ---
+
+def test_world_state_view_is_read_only_and_compares_as_mapping():
+    world_state = WorldState({"health": 50})
+    snapshot = world_state.state
+    assert snapshot == dict(snapshot) and dict(snapshot) == snapshot
+    with pytest.raises(TypeError):
+        world_state.state["health"] = 1
+    assert world_state.get("health") == 50
+
+def test_evaluate_plan_clamps_like_the_live_path():
+    # A failed step with no failure effects still clamps every key, as WorldState.apply_effects does.
+    gamble = _action("Gamble")
+    gamble.success_probability = 0.0
+    evaluation = evaluate_plan([gamble], WorldState({"health": 150}), rollouts=100, seed=0)
+
+    live = WorldState({"health": 150})
+    before = live.snapshot()
+    execute_action(gamble, live, random.Random(0))
+    assert evaluation.success_rate == 0.0
+    assert (evaluation.rewards == calculate_reward(before, live.snapshot())).all()
+
+def test_evaluate_plan_follows_overridden_outcome_model():
+    class NeverWorks(Action):
+        def get_success_probability(self, state):
+            return 0.0
+    evaluation = evaluate_plan([NeverWorks()], WorldState(), rollouts=100, seed=0)
+    assert evaluation.success_rate == 0.0
+
+
+# --- Telemetry ---
+
+def test_prometheus_label_values_are_escaped():
+    tracer = Telemetry(enabled=True)
+    tracer.increment("decisions_total", goal='say "hi"\\now\n')
+    assert 'goal="say \\"hi\\"\\\\now\\n"' in tracer.prometheus_text()